@@ -12,6 +12,11 @@ from core import checks
 from core.models import PermissionLevel, getLogger
 from core.utils import safe_typing
 
+try:
+    import numpy as np  # optional: vectorized summary statistics
+except Exception:
+    np = None  # type: ignore
+
 logger = getLogger(__name__)
 
 
@@ -94,6 +99,25 @@ def parse_period_arg(arg: Optional[str]) -> Tuple[datetime, datetime, str]:
     raise commands.BadArgument("Invalid period. Use YYYY-MM, 'this', 'last', or 'Month YYYY'.")
 
 
+def parse_rolling_period(period: Optional[str]) -> Tuple[datetime, datetime, str]:
+    """Like parse_period_arg, but also accepts 'Nd' and defaults to the last 30 days.
+
+    Raises ValueError for an unparsable day count.
+    """
+    if period and period.strip().lower().endswith("d"):
+        days = int(period.strip().lower()[:-1] or "30")
+        end = _utcnow().replace(tzinfo=timezone.utc)
+        return end - timedelta(days=days), end, f"last {days} days"
+    # treat as calendar period
+    try:
+        if period:
+            return parse_period_arg(period)
+    except commands.BadArgument:
+        pass
+    end = _utcnow().replace(tzinfo=timezone.utc)
+    return end - timedelta(days=30), end, "last 30 days"
+
+
 @dataclass
 class CaseStats:
     key: str
@@ -208,6 +232,200 @@ def stats_to_csv(stats: Iterable[CaseStats]) -> bytes:
     return out.getvalue().encode("utf-8")
 
 
+class CaseColumns:
+    """Columnar view of a list of CaseStats, built once per query.
+
+    Rows are aligned: ``durations[i]``, ``frts[i]`` and ``closer_ids[i]`` all describe
+    the same case. Missing values are NaN (0 for closer ids). Uses NumPy arrays when
+    available and plain lists (with None for missing values) otherwise.
+    """
+
+    __slots__ = ("count", "durations", "frts", "closer_ids")
+
+    def __init__(self, durations, frts, closer_ids):
+        self.count = len(closer_ids)
+        self.durations = durations
+        self.frts = frts
+        self.closer_ids = closer_ids
+
+    @classmethod
+    def from_stats(cls, stats: Iterable[CaseStats]) -> "CaseColumns":
+        durations: List[Optional[float]] = []
+        frts: List[Optional[float]] = []
+        closers: List[int] = []
+        for s in stats:
+            if s.created_at and s.closed_at:
+                durations.append((s.closed_at - s.created_at).total_seconds())
+            else:
+                durations.append(None)
+            frts.append(s.first_response_seconds)
+            try:
+                closers.append(int(s.closer_id) if s.closer_id else 0)
+            except ValueError:
+                closers.append(0)
+        return cls.from_lists(durations, frts, closers)
+
+    @classmethod
+    def from_lists(
+        cls, durations: List[Optional[float]], frts: List[Optional[float]], closer_ids: List[int]
+    ) -> "CaseColumns":
+        """Build from aligned Python lists, converting to arrays when NumPy is available."""
+        if np is None:
+            return cls(durations, frts, closer_ids)
+        return cls(_column(durations), _column(frts), np.array(closer_ids, dtype=np.int64))
+
+
+def _column(values: List[Optional[float]]):
+    """A float column: NumPy array with NaN for missing values, or the list itself without NumPy."""
+    if np is None:
+        return values
+    nan = float("nan")
+    return np.array([nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile of a pre-sorted list (same method as numpy's default)."""
+    if not values:
+        return None
+    pos = (len(values) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return float(values[lo] + (values[hi] - values[lo]) * (pos - lo))
+
+
+def _describe(values) -> Dict[str, Optional[float]]:
+    """mean/median/p90/p99 of a column, ignoring missing values."""
+    if np is not None:
+        arr = values[~np.isnan(values)]
+        if not arr.size:
+            return {"avg": None, "median": None, "p90": None, "p99": None}
+        p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+        return {"avg": float(arr.mean()), "median": float(p50), "p90": float(p90), "p99": float(p99)}
+    arr = sorted(v for v in values if v is not None)
+    if not arr:
+        return {"avg": None, "median": None, "p90": None, "p99": None}
+    return {
+        "avg": sum(arr) / len(arr),
+        "median": _percentile(arr, 50),
+        "p90": _percentile(arr, 90),
+        "p99": _percentile(arr, 99),
+    }
+
+
+# FRT SLA bucket upper bounds (inclusive), in seconds; anything above the last is ">2h"
+SLA_EDGES = (5 * 60, 30 * 60, 2 * 3600)
+SLA_LABELS = ("<=5m", "<=30m", "<=2h", ">2h")
+
+
+def sla_histogram(frts) -> Dict[str, int]:
+    """Count first response times per SLA bucket."""
+    if np is not None:
+        arr = frts[~np.isnan(frts)]
+        # side="left" puts values equal to an edge into that edge's bucket (<=)
+        idx = np.searchsorted(np.asarray(SLA_EDGES, dtype=np.float64), arr, side="left")
+        counts = np.bincount(idx, minlength=len(SLA_LABELS))
+        return {label: int(c) for label, c in zip(SLA_LABELS, counts)}
+    buckets = dict.fromkeys(SLA_LABELS, 0)
+    for v in frts:
+        if v is None:
+            continue
+        for edge, label in zip(SLA_EDGES, SLA_LABELS):
+            if v <= edge:
+                buckets[label] += 1
+                break
+        else:
+            buckets[SLA_LABELS[-1]] += 1
+    return buckets
+
+
+def staff_breakdown(cols: CaseColumns) -> List[Tuple[int, int, Optional[float], Optional[float]]]:
+    """Group cases by closer.
+
+    Returns (closer_id, cases, avg_duration, avg_frt) sorted by case count, descending,
+    then by closer id. Cases without a closer are ignored.
+    """
+    out: List[Tuple[int, int, Optional[float], Optional[float]]] = []
+    if np is not None:
+        mask = cols.closer_ids != 0
+        if not mask.any():
+            return out
+        ids, inverse, counts = np.unique(cols.closer_ids[mask], return_inverse=True, return_counts=True)
+
+        def _group_mean(col):
+            vals = col[mask]
+            ok = ~np.isnan(vals)
+            sums = np.bincount(inverse[ok], weights=vals[ok], minlength=ids.size)
+            ns = np.bincount(inverse[ok], minlength=ids.size)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(ns > 0, sums / np.maximum(ns, 1), np.nan)
+
+        dur = _group_mean(cols.durations)
+        frt = _group_mean(cols.frts)
+        for i in np.lexsort((ids, -counts)):
+            out.append((
+                int(ids[i]),
+                int(counts[i]),
+                None if np.isnan(dur[i]) else float(dur[i]),
+                None if np.isnan(frt[i]) else float(frt[i]),
+            ))
+        return out
+
+    groups: Dict[int, Tuple[List[float], List[float]]] = {}
+    counts: Dict[int, int] = {}
+    for uid, d, f in zip(cols.closer_ids, cols.durations, cols.frts):
+        if not uid:
+            continue
+        durs, frs = groups.setdefault(uid, ([], []))
+        counts[uid] = counts.get(uid, 0) + 1
+        if d is not None:
+            durs.append(d)
+        if f is not None:
+            frs.append(f)
+    for uid in sorted(groups, key=lambda u: (-counts[u], u)):
+        durs, frs = groups[uid]
+        out.append((
+            uid,
+            counts[uid],
+            sum(durs) / len(durs) if durs else None,
+            sum(frs) / len(frs) if frs else None,
+        ))
+    return out
+
+
+TREND_UNITS = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def bucket_floor(dt: datetime, unit: str) -> datetime:
+    """Start of the UTC day/ISO week (Monday) containing dt; matches $dateTrunc."""
+    day = datetime(dt.year, dt.month, dt.day, tzinfo=timezone.utc)
+    if unit == "week":
+        day -= timedelta(days=day.weekday())
+    return day
+
+
+def sparkline(values: List[Optional[float]]) -> str:
+    """Compact one-line chart; missing values render as a space."""
+    present = [v for v in values if v is not None]
+    if not present:
+        return " " * len(values)
+    lo, hi = min(present), max(present)
+    span = (hi - lo) or 1
+    top = len(SPARK_CHARS) - 1
+    return "".join(
+        " " if v is None else SPARK_CHARS[int(round((v - lo) / span * top))] for v in values
+    )
+
+
+@dataclass
+class TrendBucket:
+    start: datetime
+    opened: int
+    closed: int
+    median_frt: Optional[float]
+    backlog: int
+
+
 def aggregate_leaderboard(
     docs: List[dict], *, allowed_types: Optional[Set[str]] = None
 ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
@@ -242,6 +460,23 @@ def aggregate_leaderboard(
     return closers, senders
 
 
+# Projection to reduce payload; we still need messages for metrics
+LOG_PROJECTION = {
+    "key": 1,
+    "channel_id": 1,
+    "created_at": 1,
+    "closed_at": 1,
+    "recipient": 1,
+    "creator": 1,
+    "closer": 1,
+    # only keep mod flag, author id and timestamp in messages
+    "messages.author.mod": 1,
+    "messages.author.id": 1,
+    "messages.timestamp": 1,
+    "messages.type": 1,
+}
+
+
 class CaseExporter(commands.Cog):
     """Export closed/opened cases by month and show leaderboards."""
 
@@ -251,6 +486,13 @@ class CaseExporter(commands.Cog):
         # Key: (field, start_iso, end_iso) -> (cached_at, docs)
         self._cache: Dict[Tuple[str, str, str], Tuple[datetime, List[dict]]] = {}
         self._cache_ttl = timedelta(minutes=5)
+        # In-flight queries keyed like the cache, so concurrent identical ranges share one DB round-trip
+        self._inflight: Dict[Tuple[str, str, str], "asyncio.Task[List[dict]]"] = {}
+        self._indexes_ready = False
+        # Completed trend buckets never change: (unit, replies_only, bucket_start_iso) -> (cached_at, TrendBucket);
+        # they still expire so buckets nobody asks for again don't pile up
+        self._trend_cache: Dict[Tuple[str, bool, str], Tuple[datetime, TrendBucket]] = {}
+        self._trend_cache_ttl = timedelta(hours=1)
         # defaults for plugin config
         self._default_cfg = {"count_replies_only": False}
 
@@ -286,14 +528,11 @@ class CaseExporter(commands.Cog):
     async def _query_logs_in_range(self, start: datetime, end: datetime, *, field: str) -> List[dict]:
         """
         Query logs by ISO 8601 string range on a given field (created_at/closed_at).
-        Falls back to client-side filtering if necessary.
+        Falls back to client-side filtering if necessary. Concurrent calls for the
+        same range are coalesced into a single query.
         """
         start_iso = start.isoformat()
         end_iso = end.isoformat()
-        guild_id = str(self.bot.guild_id)
-
-        coll = self.bot.api.db.logs
-        query = {"guild_id": guild_id, field: {"$gte": start_iso, "$lt": end_iso}}
 
         # Cache check
         cache_key = (field, start_iso, end_iso)
@@ -301,21 +540,33 @@ class CaseExporter(commands.Cog):
         if cached and (_utcnow() - cached[0]) <= self._cache_ttl:
             return cached[1]
 
-        # Projection to reduce payload; we still need messages for metrics
-        projection = {
-            "key": 1,
-            "channel_id": 1,
-            "created_at": 1,
-            "closed_at": 1,
-            "recipient": 1,
-            "creator": 1,
-            "closer": 1,
-            # only keep mod flag, author id and timestamp in messages
-            "messages.author.mod": 1,
-            "messages.author.id": 1,
-            "messages.timestamp": 1,
-            "messages.type": 1,
-        }
+        # Single-flight: join an identical query that is already running
+        task = self._inflight.get(cache_key)
+        if task is None:
+            self._evict_expired()
+            task = asyncio.create_task(self._fetch_logs_in_range(start, end, field=field))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(cache_key, None))
+        # shield so one cancelled caller doesn't cancel the query for everyone else
+        return await asyncio.shield(task)
+
+    def _evict_expired(self) -> None:
+        """Drop expired entries from the logs and trend caches."""
+        now = _utcnow()
+        for cache, ttl in ((self._cache, self._cache_ttl), (self._trend_cache, self._trend_cache_ttl)):
+            for key in [k for k, (cached_at, _) in cache.items() if now - cached_at > ttl]:
+                del cache[key]
+
+    async def _fetch_logs_in_range(self, start: datetime, end: datetime, *, field: str) -> List[dict]:
+        start_iso = start.isoformat()
+        end_iso = end.isoformat()
+        guild_id = str(self.bot.guild_id)
+        cache_key = (field, start_iso, end_iso)
+
+        coll = self.bot.api.db.logs
+        query = {"guild_id": guild_id, field: {"$gte": start_iso, "$lt": end_iso}}
+
+        projection = LOG_PROJECTION
         try:
             docs = await coll.find(query, projection).to_list(None)
             # Some entries may store None for closed_at; keep filter strict in Python too
@@ -341,6 +592,179 @@ class CaseExporter(commands.Cog):
             self._cache[cache_key] = (_utcnow(), res)
             return res
 
+    async def _ensure_indexes(self) -> None:
+        """Create the indexes used by per-staff queries (once per cog load)."""
+        if self._indexes_ready:
+            return
+        coll = self.bot.api.db.logs
+        try:
+            # multikey over the messages array: one entry per author id per log
+            await coll.create_index(
+                [("guild_id", 1), ("messages.author.id", 1), ("closed_at", 1)],
+                name="cases_staff_author",
+            )
+            # $or can only use indexes if every branch has one
+            await coll.create_index(
+                [("guild_id", 1), ("closer.id", 1), ("closed_at", 1)],
+                name="cases_staff_closer",
+            )
+        except Exception:
+            logger.debug("Failed ensuring per-staff indexes.", exc_info=True)
+        self._indexes_ready = True
+
+    async def _query_staff_logs(self, staff_id: int, start: datetime, end: datetime) -> List[dict]:
+        """Closed logs in range where the staff member sent a message or closed the thread."""
+        await self._ensure_indexes()
+        sid = str(staff_id)
+        query = {
+            "guild_id": str(self.bot.guild_id),
+            "closed_at": {"$gte": start.isoformat(), "$lt": end.isoformat()},
+            "$or": [{"messages.author.id": sid}, {"closer.id": sid}],
+        }
+        docs = await self.bot.api.db.logs.find(query, LOG_PROJECTION).to_list(None)
+        result = []
+        for d in docs:
+            dt = iso_to_dt(d.get("closed_at"))
+            if dt and start <= dt < end:
+                result.append(d)
+        return result
+
+    # ---- trend series ----
+    @staticmethod
+    def _trend_pipeline(field: str, unit: str, start: datetime, end: datetime,
+                        guild_id: str, allowed: Optional[Set[str]]) -> List[dict]:
+        """Group logs by $dateTrunc bucket of `field`; closed buckets also collect FRTs."""
+
+        def _iso_date(expr) -> dict:
+            # Logs store UTC isoformat() strings, sometimes with microseconds/offsets the
+            # server parser rejects; the first 19 chars are always YYYY-MM-DDTHH:MM:SS.
+            return {
+                "$dateFromString": {
+                    "dateString": {"$substrBytes": [expr, 0, 19]},
+                    "format": "%Y-%m-%dT%H:%M:%S",
+                    "timezone": "UTC",
+                    "onError": None,
+                    "onNull": None,
+                }
+            }
+
+        trunc: dict = {"date": _iso_date(f"${field}"), "unit": unit, "timezone": "UTC"}
+        if unit == "week":
+            trunc["startOfWeek"] = "monday"
+        bucket = {"$dateTrunc": trunc}
+        group: dict = {"_id": "$bucket", "count": {"$sum": 1}}
+        project: dict = {"bucket": bucket}
+        if field == "closed_at":
+            mod_cond: dict = {"$eq": ["$$m.author.mod", True]}
+            if allowed is not None:
+                mod_cond = {"$and": [mod_cond, {"$in": ["$$m.type", sorted(allowed)]}]}
+
+            def _first_ts(cond: dict) -> dict:
+                # timestamp of the first message matching cond, as a date (null if none)
+                matching = {"$filter": {"input": {"$ifNull": ["$messages", []]}, "as": "m", "cond": cond}}
+                stamps = {"$map": {"input": matching, "as": "m", "in": "$$m.timestamp"}}
+                return _iso_date({"$ifNull": [{"$arrayElemAt": [stamps, 0]}, ""]})
+
+            first_user = _first_ts({"$ne": ["$$m.author.mod", True]})
+            first_mod = _first_ts(mod_cond)
+            project["frt_ms"] = {"$subtract": [first_mod, first_user]}
+            group["frts"] = {"$push": "$frt_ms"}
+        return [
+            {"$match": {"guild_id": guild_id, field: {"$gte": start.isoformat(), "$lt": end.isoformat()}}},
+            {"$project": project},
+            {"$group": group},
+        ]
+
+    async def _trend_counts(self, unit: str, start: datetime, end: datetime,
+                            allowed: Optional[Set[str]]):
+        """Returns (opened, closed, frts, backlog_at_start) keyed by bucket start.
+
+        Uses aggregation pipelines so only per-bucket numbers leave the database;
+        falls back to a projected client-side pass on servers without $dateTrunc.
+        """
+        coll = self.bot.api.db.logs
+        guild_id = str(self.bot.guild_id)
+        start_iso = start.isoformat()
+        backlog_query = {
+            "guild_id": guild_id,
+            "created_at": {"$lt": start_iso},
+            "$or": [{"closed_at": None}, {"closed_at": {"$gte": start_iso}}],
+        }
+        opened: Dict[datetime, int] = {}
+        closed: Dict[datetime, int] = {}
+        frts: Dict[datetime, List[float]] = {}
+        try:
+            opened_rows, closed_rows, backlog_rows = await asyncio.gather(
+                coll.aggregate(self._trend_pipeline("created_at", unit, start, end, guild_id, allowed)).to_list(None),
+                coll.aggregate(self._trend_pipeline("closed_at", unit, start, end, guild_id, allowed)).to_list(None),
+                coll.aggregate([{"$match": backlog_query}, {"$count": "n"}]).to_list(None),
+            )
+            for row in opened_rows:
+                if row["_id"] is not None:
+                    opened[row["_id"].replace(tzinfo=timezone.utc)] = row["count"]
+            for row in closed_rows:
+                if row["_id"] is None:
+                    continue
+                key = row["_id"].replace(tzinfo=timezone.utc)
+                closed[key] = row["count"]
+                frts[key] = [v / 1000.0 for v in row.get("frts") or [] if v is not None and v >= 0]
+            backlog = backlog_rows[0]["n"] if backlog_rows else 0
+            return opened, closed, frts, backlog
+        except Exception:
+            logger.debug("Trend aggregation failed; falling back to client bucketing.", exc_info=True)
+
+        opened.clear()
+        closed.clear()
+        frts.clear()
+        created_docs, closed_docs, backlog = await asyncio.gather(
+            self._query_logs_in_range(start, end, field="created_at"),
+            self._query_logs_in_range(start, end, field="closed_at"),
+            coll.count_documents(backlog_query),
+        )
+        for d in created_docs:
+            key = bucket_floor(iso_to_dt(d.get("created_at")), unit)
+            opened[key] = opened.get(key, 0) + 1
+        for d in closed_docs:
+            key = bucket_floor(iso_to_dt(d.get("closed_at")), unit)
+            closed[key] = closed.get(key, 0) + 1
+            frt = compute_case_stats(d, allowed_types=allowed).first_response_seconds
+            if frt is not None:
+                frts.setdefault(key, []).append(frt)
+        return opened, closed, frts, backlog
+
+    async def _trend_series(self, unit: str, count: int, allowed: Optional[Set[str]]) -> List[TrendBucket]:
+        """Last `count` buckets (including the current, partial one), oldest first."""
+        step = TREND_UNITS[unit]
+        now = _utcnow()
+        current = bucket_floor(now, unit)
+        starts = [current - step * i for i in range(count - 1, -1, -1)]
+        replies_only = allowed is not None
+
+        # Reuse the leading run of cached, completed buckets; only query from the first gap
+        series: List[TrendBucket] = []
+        for b in starts:
+            cached = self._trend_cache.get((unit, replies_only, b.isoformat()))
+            if cached is None or now - cached[0] > self._trend_cache_ttl:
+                break
+            series.append(cached[1])
+        remaining = starts[len(series):]
+        if not remaining:
+            return series
+
+        q_start, q_end = remaining[0], current + step
+        opened, closed, frts, backlog = await self._trend_counts(unit, q_start, q_end, allowed)
+        for b in remaining:
+            o, c = opened.get(b, 0), closed.get(b, 0)
+            backlog += o - c
+            vals = frts.get(b) or []
+            median = _describe(_column(vals))["median"]
+            bucket = TrendBucket(start=b, opened=o, closed=c, median_frt=median, backlog=backlog)
+            series.append(bucket)
+            if b + step <= now:
+                self._trend_cache[(unit, replies_only, b.isoformat())] = (now, bucket)
+        self._evict_expired()
+        return series
+
     # ---- summaries & metrics ----
     @staticmethod
     def _format_duration(seconds: Optional[int]) -> str:
@@ -358,48 +782,27 @@ class CaseExporter(commands.Cog):
         return f"{sec}s"
 
     @staticmethod
-    def _calc_summary(stats: List[CaseStats]) -> Dict[str, Optional[float]]:
-        import math
-        durations = [
-            (s.closed_at - s.created_at).total_seconds()
-            for s in stats
-            if s.created_at and s.closed_at
-        ]
-        frts = [s.first_response_seconds for s in stats if s.first_response_seconds is not None]
-
-        def _avg(arr: List[float]) -> Optional[float]:
-            return sum(arr) / len(arr) if arr else None
-
-        def _median(arr: List[float]) -> Optional[float]:
-            if not arr:
-                return None
-            arr = sorted(arr)
-            mid = len(arr) // 2
-            if len(arr) % 2 == 1:
-                return float(arr[mid])
-            return (arr[mid - 1] + arr[mid]) / 2.0
+    def _calc_summary(stats) -> Dict[str, Optional[float]]:
+        """Summary statistics for a list of CaseStats (or a prebuilt CaseColumns)."""
+        cols = stats if isinstance(stats, CaseColumns) else CaseColumns.from_stats(stats)
+        dur = _describe(cols.durations)
+        frt = _describe(cols.frts)
 
         # SLA buckets for FRT
-        buckets = {"<=5m": 0, "<=30m": 0, "<=2h": 0, ">2h": 0}
-        for v in frts:
-            if v <= 5 * 60:
-                buckets["<=5m"] += 1
-            elif v <= 30 * 60:
-                buckets["<=30m"] += 1
-            elif v <= 2 * 3600:
-                buckets["<=2h"] += 1
-            else:
-                buckets[">2h"] += 1
-
-        total = len(frts) or 1
+        buckets = sla_histogram(cols.frts)
+        total = sum(buckets.values()) or 1
         sla_pct = {k: (v * 100.0) / total for k, v in buckets.items()}
 
         return {
-            "count": len(stats),
-            "avg_duration": _avg(durations),
-            "median_duration": _median(durations),
-            "avg_frt": _avg(frts),
-            "median_frt": _median(frts),
+            "count": cols.count,
+            "avg_duration": dur["avg"],
+            "median_duration": dur["median"],
+            "p90_duration": dur["p90"],
+            "p99_duration": dur["p99"],
+            "avg_frt": frt["avg"],
+            "median_frt": frt["median"],
+            "p90_frt": frt["p90"],
+            "p99_frt": frt["p99"],
             "sla_5m": sla_pct["<=5m"],
             "sla_30m": sla_pct["<=30m"],
             "sla_2h": sla_pct["<=2h"],
@@ -419,7 +822,9 @@ class CaseExporter(commands.Cog):
             f"• `{self.bot.prefix}cases export this json` → this month JSON\n"
             f"• `{self.bot.prefix}cases export 2025-11` → Nov 2025 CSV\n"
             f"• `{self.bot.prefix}cases lb` → leaderboard 30d\n"
+            f"• `{self.bot.prefix}cases staff @mod this` → one staff member's month\n"
             f"• `{self.bot.prefix}cases summary last` → last month summary\n"
+            f"• `{self.bot.prefix}cases trend daily` → daily opened/closed/FRT/backlog\n"
             "\nSettings:\n"
             f"• `{self.bot.prefix}cases cfg` → view settings\n"
             f"• `{self.bot.prefix}cases cfg replies-only on` → count replies only\n"
@@ -546,6 +951,13 @@ class CaseExporter(commands.Cog):
             name="Median First Response",
             value=self._format_duration(int(summary["median_frt"])) if summary["median_frt"] else "—",
         )
+        embed.add_field(
+            name="p90 / p99 First Response",
+            value=(
+                f"{self._format_duration(int(summary['p90_frt'])) if summary['p90_frt'] is not None else '—'} / "
+                f"{self._format_duration(int(summary['p99_frt'])) if summary['p99_frt'] is not None else '—'}"
+            ),
+        )
         embed.add_field(
             name="SLA (<=5m / 30m / 2h / >2h)",
             value=(
@@ -599,26 +1011,10 @@ class CaseExporter(commands.Cog):
         Default is last 30 days if omitted.
         """
         # Decide range
-        if period and period.strip().lower().endswith("d"):
-            try:
-                days = int(period.strip().lower()[:-1] or "30")
-            except ValueError:
-                return await ctx.send("Invalid days value. Try '30d'.")
-            end = _utcnow().replace(tzinfo=timezone.utc)
-            start = end - timedelta(days=days)
-            label = f"last {days} days"
-        else:
-            # treat as calendar period
-            try:
-                start, end, label = parse_period_arg(period) if period else (None, None, None)
-                if start is None:
-                    end = _utcnow().replace(tzinfo=timezone.utc)
-                    start = end - timedelta(days=30)
-                    label = "last 30 days"
-            except commands.BadArgument:
-                end = _utcnow().replace(tzinfo=timezone.utc)
-                start = end - timedelta(days=30)
-                label = "last 30 days"
+        try:
+            start, end, label = parse_rolling_period(period)
+        except ValueError:
+            return await ctx.send("Invalid days value. Try '30d'.")
 
         async with safe_typing(ctx):
             pass
@@ -719,6 +1115,100 @@ class CaseExporter(commands.Cog):
             embed.set_footer(text="Messages counted: Replies only (thread_message, anonymous)")
         await ctx.send(embed=embed)
 
+    @checks.has_permissions(PermissionLevel.MODERATOR)
+    @cases.command(name="staff", aliases=["mod", "member", "cstaff"])
+    async def cases_staff(self, ctx: commands.Context, member: discord.Member, *, period: Optional[str] = None):
+        """Drill-down for one staff member over a month or last 30 days.
+
+        period: YYYY-MM | this | last | Month YYYY | 30d
+        Default is last 30 days if omitted.
+        """
+        try:
+            start, end, label = parse_rolling_period(period)
+        except ValueError:
+            return await ctx.send("Invalid days value. Try '30d'.")
+
+        async with safe_typing(ctx):
+            pass
+        docs = await self._query_staff_logs(member.id, start, end)
+        if not docs:
+            return await ctx.send(f"No closed cases involving {member.display_name} for {label}.")
+
+        cfg = await self._get_cfg()
+        allowed = self._allowed_types(cfg)
+        sid = str(member.id)
+
+        participated = 0
+        closed = 0
+        replies = 0
+        first_responses = 0
+        frts: List[Optional[float]] = []
+        handle: List[Optional[float]] = []
+        for doc in docs:
+            is_closer = str((doc.get("closer") or {}).get("id")) == sid
+            sent = 0
+            first_user = None
+            first_mod = None
+            for m in doc.get("messages") or []:
+                a = m.get("author") or {}
+                if not a.get("mod"):
+                    if first_user is None:
+                        first_user = iso_to_dt(m.get("timestamp"))
+                    continue
+                if allowed is not None and m.get("type") not in allowed:
+                    continue
+                if first_mod is None:
+                    first_mod = (iso_to_dt(m.get("timestamp")), str(a.get("id")))
+                if str(a.get("id")) == sid:
+                    sent += 1
+            replies += sent
+            if sent:
+                participated += 1
+            if first_user and first_mod and first_mod[0] and first_mod[1] == sid:
+                delta = (first_mod[0] - first_user).total_seconds()
+                if delta >= 0:
+                    first_responses += 1
+                    frts.append(delta)
+            if is_closer:
+                closed += 1
+                created_at = iso_to_dt(doc.get("created_at"))
+                closed_at = iso_to_dt(doc.get("closed_at"))
+                if created_at and closed_at:
+                    handle.append((closed_at - created_at).total_seconds())
+
+        frt_col = _column(frts)
+        handle_col = _column(handle)
+        frt = _describe(frt_col)
+        dur = _describe(handle_col)
+        buckets = sla_histogram(frt_col)
+        total = sum(buckets.values()) or 1
+
+        def _fd(v: Optional[float]) -> str:
+            return self._format_duration(int(v)) if v is not None else "—"
+
+        embed = discord.Embed(
+            title=f"Staff Activity — {member.display_name} — {label}", color=self.bot.main_color
+        )
+        embed.add_field(name="Cases Involved", value=str(len(docs)))
+        embed.add_field(name="Replied In", value=str(participated))
+        embed.add_field(name="Closed", value=str(closed))
+        embed.add_field(name="Messages Sent", value=str(replies))
+        embed.add_field(name="First Responses", value=str(first_responses))
+        embed.add_field(name="Median Handle Time", value=_fd(dur["median"]))
+        embed.add_field(
+            name="First Response (median / p90 / p99)",
+            value=f"{_fd(frt['median'])} / {_fd(frt['p90'])} / {_fd(frt['p99'])}",
+            inline=False,
+        )
+        embed.add_field(
+            name="FRT SLA (<=5m / 30m / 2h / >2h)",
+            value=" / ".join(f"{buckets[k] * 100.0 / total:.0f}%" for k in SLA_LABELS),
+            inline=False,
+        )
+        if allowed is not None:
+            embed.set_footer(text="Messages counted: Replies only (thread_message, anonymous)")
+        await ctx.send(embed=embed)
+
     @checks.has_permissions(PermissionLevel.MODERATOR)
     @cases.command(name="summary", aliases=["sum", "overview", "csummary"]) 
     async def cases_summary(self, ctx: commands.Context, *, period: Optional[str] = None):
@@ -730,15 +1220,18 @@ class CaseExporter(commands.Cog):
 
         async with safe_typing(ctx):
             pass
-        # One query for closed, one for opened (kept cached if re-used elsewhere)
-        closed_docs = await self._query_logs_in_range(start, end, field="closed_at")
-        opened_docs = await self._query_logs_in_range(start, end, field="created_at")
+        # One query for closed, one for opened, run concurrently (kept cached if re-used elsewhere)
+        closed_docs, opened_docs = await asyncio.gather(
+            self._query_logs_in_range(start, end, field="closed_at"),
+            self._query_logs_in_range(start, end, field="created_at"),
+        )
 
         cfg = await self._get_cfg()
         allowed = self._allowed_types(cfg)
         closed_stats = [compute_case_stats(d, allowed_types=allowed) for d in closed_docs]
         opened_stats = [compute_case_stats(d, allowed_types=allowed) for d in opened_docs]
-        s_closed = self._calc_summary(closed_stats)
+        closed_cols = CaseColumns.from_stats(closed_stats)
+        s_closed = self._calc_summary(closed_cols)
         s_opened = self._calc_summary(opened_stats)
 
         embed = discord.Embed(title=f"Cases Summary — {label}", color=self.bot.main_color)
@@ -749,6 +1242,7 @@ class CaseExporter(commands.Cog):
                 f"Avg Dur: {self._format_duration(int(s_closed['avg_duration'])) if s_closed['avg_duration'] else '—'}\n"
                 f"Median Dur: {self._format_duration(int(s_closed['median_duration'])) if s_closed['median_duration'] else '—'}\n"
                 f"Avg FRT: {self._format_duration(int(s_closed['avg_frt'])) if s_closed['avg_frt'] else '—'}\n"
+                f"p90 FRT: {self._format_duration(int(s_closed['p90_frt'])) if s_closed['p90_frt'] is not None else '—'}\n"
                 f"SLA <=5m: {s_closed['sla_5m']:.0f}%"
             ),
             inline=True,
@@ -764,12 +1258,67 @@ class CaseExporter(commands.Cog):
             ),
             inline=True,
         )
+        per_staff = staff_breakdown(closed_cols)[:5]
+        if per_staff:
+            guild = self.bot.modmail_guild
+            lines = []
+            for uid, count, avg_dur, avg_frt in per_staff:
+                member = guild and guild.get_member(uid)
+                name = member.display_name if member else f"User {uid}"
+                lines.append(
+                    f"{name} — {count} closed, avg dur {self._format_duration(avg_dur)}, "
+                    f"avg FRT {self._format_duration(avg_frt)}"
+                )
+            embed.add_field(name="Top Closers", value="\n".join(lines), inline=False)
         footer = "All times in UTC; exported data contains precise timestamps."
         if allowed is not None:
             footer += " Messages counted: Replies only."
         embed.set_footer(text=footer)
         await ctx.send(embed=embed)
 
+    @checks.has_permissions(PermissionLevel.MODERATOR)
+    @cases.command(name="trend", aliases=["trends", "series", "ctrend"])
+    async def cases_trend(self, ctx: commands.Context, granularity: str = "weekly", count: Optional[int] = None):
+        """Daily or weekly series of opened, closed, median first response and backlog.
+
+        granularity: daily | weekly (default weekly)
+        count: number of buckets including the current one (default 14 days / 12 weeks)
+        """
+        units = {"daily": "day", "day": "day", "d": "day", "weekly": "week", "week": "week", "w": "week"}
+        unit = units.get(granularity.lower())
+        if unit is None:
+            return await ctx.send("Invalid granularity. Use 'daily' or 'weekly'.")
+        limit = 60 if unit == "day" else 52
+        count = count or (14 if unit == "day" else 12)
+        if not 1 <= count <= limit:
+            return await ctx.send(f"Count must be between 1 and {limit} for {granularity.lower()} trends.")
+
+        async with safe_typing(ctx):
+            pass
+        cfg = await self._get_cfg()
+        allowed = self._allowed_types(cfg)
+        series = await self._trend_series(unit, count, allowed)
+
+        fmt = "%m-%d" if unit == "day" else "%Y-%m-%d"
+        rows = [f"{'Bucket':<10} {'Open':>5} {'Closed':>6} {'Med FRT':>8} {'Backlog':>7}"]
+        for b in series:
+            frt = self._format_duration(int(b.median_frt)) if b.median_frt is not None else "—"
+            rows.append(f"{b.start.strftime(fmt):<10} {b.opened:>5} {b.closed:>6} {frt:>8} {b.backlog:>7}")
+        sparks = (
+            f"Opened  {sparkline([b.opened for b in series])}\n"
+            f"Closed  {sparkline([b.closed for b in series])}\n"
+            f"Med FRT {sparkline([b.median_frt for b in series])}\n"
+            f"Backlog {sparkline([b.backlog for b in series])}"
+        )
+        title = f"Cases Trend — last {count} {'days' if unit == 'day' else 'weeks'}"
+        embed = discord.Embed(title=title, color=self.bot.main_color)
+        embed.description = f"```\n{sparks}\n```\n```\n" + "\n".join(rows) + "\n```"
+        footer = "UTC buckets; weeks start Monday. The latest bucket is still in progress."
+        if allowed is not None:
+            footer += " Messages counted: Replies only."
+        embed.set_footer(text=footer)
+        await ctx.send(embed=embed)
+
     @checks.has_permissions(PermissionLevel.MODERATOR)
     @cases.command(name="monthly")
     async def cases_monthly(self, ctx: commands.Context):
@@ -0,0 +1,194 @@
+"""
+Minimal in-memory stand-in for the motor collections the tracker uses.
+
+Supports the subset of MongoDB the plugin relies on: equality, $gte/$gt/$lt/$lte/$in
+and $or filters on (dotted) fields, inclusion projections, find().to_list(),
+find_one, count_documents, update_one with $set/$inc/upsert, aggregate with
+$match/$count (other stages raise, like an old server would, so callers take
+their fallback path) and create_index (recorded, no-op).
+Array fields are matched element-wise, as in Mongo.
+"""
+import asyncio
+import copy
+from typing import Any, Dict, List, Optional
+
+
+def _get_path(doc: Any, path: List[str]) -> List[Any]:
+    """All values reachable at a dotted path, descending into arrays."""
+    if not path:
+        return [doc]
+    if isinstance(doc, list):
+        out: List[Any] = []
+        for item in doc:
+            out.extend(_get_path(item, path))
+        return out
+    if not isinstance(doc, dict) or path[0] not in doc:
+        return []
+    return _get_path(doc[path[0]], path[1:])
+
+
+def _match_value(value: Any, cond: Any) -> bool:
+    if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+        for op, arg in cond.items():
+            try:
+                if op == "$gte" and not (value is not None and value >= arg):
+                    return False
+                if op == "$gt" and not (value is not None and value > arg):
+                    return False
+                if op == "$lt" and not (value is not None and value < arg):
+                    return False
+                if op == "$lte" and not (value is not None and value <= arg):
+                    return False
+                if op == "$in" and value not in arg:
+                    return False
+                if op == "$ne" and value == arg:
+                    return False
+            except TypeError:
+                return False
+        return True
+    return value == cond
+
+
+def matches(doc: dict, query: dict) -> bool:
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in cond):
+                return False
+            continue
+        if key == "$and":
+            if not all(matches(doc, sub) for sub in cond):
+                return False
+            continue
+        values = _get_path(doc, key.split("."))
+        if not values:
+            values = [None]
+        if not any(_match_value(v, cond) for v in values):
+            return False
+    return True
+
+
+def _project(doc: Any, tree: Dict[str, Any]) -> Any:
+    if isinstance(doc, list):
+        return [_project(item, tree) for item in doc if isinstance(item, (dict, list))]
+    if not isinstance(doc, dict):
+        return doc
+    out = {}
+    for key, sub in tree.items():
+        if key not in doc:
+            continue
+        out[key] = doc[key] if sub is True else _project(doc[key], sub)
+    return out
+
+
+def project(doc: dict, projection: Optional[dict]) -> dict:
+    if not projection:
+        return doc
+    tree: Dict[str, Any] = {"_id": True}
+    for field, flag in projection.items():
+        if not flag:
+            if field == "_id":
+                tree.pop("_id", None)
+            continue
+        node = tree
+        parts = field.split(".")
+        for part in parts[:-1]:
+            nxt = node.get(part)
+            if nxt is True:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = True
+    return _project(doc, tree)
+
+
+class FakeCursor:
+    def __init__(self, coll: "FakeCollection", query: dict, projection: Optional[dict]):
+        self._coll = coll
+        self._query = query or {}
+        self._projection = projection
+
+    async def to_list(self, length: Optional[int]):
+        self._coll.queries += 1
+        if self._coll.latency:
+            await asyncio.sleep(self._coll.latency)
+        out = []
+        for doc in self._coll.docs:
+            if matches(doc, self._query):
+                out.append(project(doc, self._projection))
+                if length is not None and len(out) >= length:
+                    break
+        self._coll.docs_returned += len(out)
+        return out
+
+
+class FakeAggregateCursor:
+    def __init__(self, coll: "FakeCollection", pipeline: List[dict]):
+        self._coll = coll
+        self._pipeline = pipeline
+
+    async def to_list(self, length: Optional[int]):
+        self._coll.queries += 1
+        docs = self._coll.docs
+        for stage in self._pipeline:
+            (op, arg), = stage.items()
+            if op == "$match":
+                docs = [d for d in docs if matches(d, arg)]
+            elif op == "$count":
+                docs = [{arg: len(docs)}] if docs else []
+            else:
+                raise NotImplementedError(f"unsupported aggregation stage {op}")
+        return docs if length is None else docs[:length]
+
+
+class FakeCollection:
+    def __init__(self, docs: Optional[List[dict]] = None, *, latency: float = 0.0):
+        self.docs: List[dict] = docs if docs is not None else []
+        self.latency = latency
+        self.indexes: List[Any] = []
+        self.queries = 0
+        self.docs_returned = 0
+
+    def find(self, query: Optional[dict] = None, projection: Optional[dict] = None) -> FakeCursor:
+        return FakeCursor(self, query or {}, projection)
+
+    async def find_one(self, query: Optional[dict] = None, projection: Optional[dict] = None):
+        res = await self.find(query, projection).to_list(1)
+        return res[0] if res else None
+
+    async def count_documents(self, query: dict) -> int:
+        self.queries += 1
+        return sum(1 for doc in self.docs if matches(doc, query))
+
+    def aggregate(self, pipeline: List[dict]) -> "FakeAggregateCursor":
+        return FakeAggregateCursor(self, pipeline)
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        for doc in self.docs:
+            if matches(doc, query):
+                break
+        else:
+            if not upsert:
+                return
+            doc = {k: v for k, v in query.items() if not k.startswith("$")}
+            self.docs.append(doc)
+        for key, val in (update.get("$set") or {}).items():
+            doc[key] = copy.deepcopy(val)
+        for key, val in (update.get("$inc") or {}).items():
+            doc[key] = doc.get(key, 0) + val
+
+    async def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+        return "_".join(f"{k}_{d}" for k, d in keys) if isinstance(keys, list) else str(keys)
+
+
+class FakeDatabase:
+    def __init__(self, **collections: FakeCollection):
+        self._collections = dict(collections)
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._collections.setdefault(name, FakeCollection())
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        return getattr(self, name)
@@ -0,0 +1,94 @@
+"""
+Seeded generator of Modmail-shaped log documents for offline benchmarks.
+
+Documents mirror what Modmail writes to the ``logs`` collection: ISO 8601
+``created_at``/``closed_at`` strings, recipient/creator/closer dicts, and a
+``messages`` array whose length follows a long-tailed distribution.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional
+
+MESSAGE_TYPES = ("thread_message", "anonymous", "internal", "system")
+
+
+def _user(rng: random.Random, uid: int, *, mod: bool) -> dict:
+    return {
+        "id": str(uid),
+        "name": f"{'staff' if mod else 'user'}{uid % 100000}",
+        "discriminator": "0",
+        "avatar_url": f"https://cdn.discordapp.com/embed/avatars/{uid % 5}.png",
+        "mod": mod,
+    }
+
+
+def iter_logs(
+    count: int,
+    *,
+    seed: int = 1234,
+    guild_id: int = 1,
+    start: Optional[datetime] = None,
+    days: int = 365,
+    staff: int = 25,
+    open_ratio: float = 0.03,
+) -> Iterator[dict]:
+    """Yield ``count`` log documents spread uniformly over ``days`` days from ``start``."""
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 1, tzinfo=timezone.utc)
+    span = days * 86400
+    staff_ids = [10_000 + i for i in range(staff)]
+    # a few staff do most of the work
+    weights = [1.0 / (i + 1) for i in range(staff)]
+    # author dicts are shared between messages to keep 500k-thread runs within memory
+    staff_users = {uid: _user(rng, uid, mod=True) for uid in staff_ids}
+
+    for n in range(count):
+        created = start + timedelta(seconds=rng.randrange(span))
+        recipient = _user(rng, 1_000_000 + rng.randrange(count * 2 + 1), mod=False)
+        # long-tailed message count: most threads are short, a few are very long
+        n_msgs = min(int(rng.paretovariate(1.3)) + 1, 400)
+        ts = created
+        messages: List[dict] = []
+        first_mod_delay = rng.expovariate(1 / 1800.0)
+        mod_seen = False
+        for i in range(n_msgs):
+            if i == 0:
+                is_mod = False
+            elif not mod_seen:
+                is_mod = True
+                ts = ts + timedelta(seconds=first_mod_delay)
+            else:
+                is_mod = rng.random() < 0.45
+            ts = ts + timedelta(seconds=rng.expovariate(1 / 240.0))
+            author = staff_users[rng.choices(staff_ids, weights)[0]] if is_mod else recipient
+            mod_seen = mod_seen or is_mod
+            messages.append({
+                "timestamp": ts.isoformat(),
+                "message_id": str(10**17 + n * 1000 + i),
+                "content": "x" * rng.randrange(10, 400),
+                "author": author,
+                "type": rng.choice(MESSAGE_TYPES[:3]) if is_mod else "thread_message",
+                "attachments": [],
+            })
+        closed = rng.random() >= open_ratio
+        closer = staff_users[rng.choices(staff_ids, weights)[0]] if closed else None
+        closed_at = (ts + timedelta(seconds=rng.expovariate(1 / 3600.0))) if closed else None
+        yield {
+            "_id": f"{n:024x}",
+            "key": f"{n:016x}",
+            "open": not closed,
+            "created_at": created.isoformat(),
+            "closed_at": closed_at.isoformat() if closed_at else None,
+            "channel_id": str(9 * 10**17 + n),
+            "guild_id": str(guild_id),
+            "bot_id": "1",
+            "recipient": recipient,
+            "creator": recipient,
+            "closer": closer,
+            "close_message": None,
+            "messages": messages,
+        }
+
+
+def make_logs(count: int, **kwargs) -> List[dict]:
+    return list(iter_logs(count, **kwargs))
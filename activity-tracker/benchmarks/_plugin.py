@@ -0,0 +1,33 @@
+"""Load the activity-tracker plugin module and build a CaseExporter over fake collections.
+
+The plugin imports ``discord`` and Modmail's ``core`` package, so benchmarks must be
+run from the Modmail bot root (or with it on PYTHONPATH).
+"""
+import importlib.util
+import pathlib
+from types import SimpleNamespace
+
+from _fakedb import FakeCollection, FakeDatabase
+
+PLUGIN_PATH = pathlib.Path(__file__).resolve().parent.parent / "activity-tracker.py"
+
+_module = None
+
+
+def load_plugin():
+    global _module
+    if _module is None:
+        spec = importlib.util.spec_from_file_location("activity_tracker", PLUGIN_PATH)
+        _module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_module)
+    return _module
+
+
+def make_cog(logs: FakeCollection, *, guild_id: int = 1):
+    """Return (cog, db) with ``bot.api.db.logs`` backed by ``logs``."""
+    mod = load_plugin()
+    db = FakeDatabase(logs=logs)
+    plugin_coll = FakeCollection()
+    api = SimpleNamespace(db=db, get_plugin_partition=lambda cog: plugin_coll)
+    bot = SimpleNamespace(guild_id=guild_id, api=api, modmail_guild=None)
+    return mod.CaseExporter(bot), db
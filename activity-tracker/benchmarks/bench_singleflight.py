@@ -0,0 +1,46 @@
+"""
+Measure single-flight coalescing in CaseExporter._query_logs_in_range.
+
+Fires N concurrent identical range queries (and a closed/opened pair, like
+`cases summary`) against a fake logs collection with a fixed latency, and
+reports wall time plus how many queries actually reached the "database".
+
+Run from the Modmail bot root so `core` and `discord` are importable:
+
+    python plugins/.../activity-tracker/benchmarks/bench_singleflight.py
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from _fakedb import FakeCollection
+from _plugin import make_cog
+
+LATENCY = 0.05  # seconds per simulated round-trip
+CONCURRENCY = 20
+
+
+async def run():
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+    logs = FakeCollection(latency=LATENCY)
+    cog, _ = make_cog(logs)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(cog._query_logs_in_range(start, end, field="closed_at") for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - t0
+    print(f"{CONCURRENCY} identical concurrent queries: {elapsed * 1000:.1f} ms, db calls={logs.queries}")
+
+    logs = FakeCollection(latency=LATENCY)
+    cog, _ = make_cog(logs)
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        cog._query_logs_in_range(start, end, field="closed_at"),
+        cog._query_logs_in_range(start, end, field="created_at"),
+    )
+    elapsed = time.perf_counter() - t0
+    print(f"closed+opened pair (gathered): {elapsed * 1000:.1f} ms, db calls={logs.queries}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
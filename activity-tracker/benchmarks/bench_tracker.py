@@ -0,0 +1,111 @@
+"""
+Synthetic-load benchmarks for the activity-tracker command paths.
+
+Generates seeded Modmail log documents, loads them into an in-memory motor
+stand-in and times each stage (query, compute_case_stats, _calc_summary,
+stats_to_csv, aggregate_leaderboard) plus the end-to-end path behind
+`cases export`, `cases leaderboard` and `cases summary`, reporting wall time
+and peak traced memory.
+
+Run from the Modmail bot root so `core` and `discord` are importable:
+
+    python plugins/.../activity-tracker/benchmarks/bench_tracker.py --sizes 10000,100000
+"""
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from _fakedb import FakeCollection
+from _generate import make_logs
+from _plugin import load_plugin, make_cog
+
+RANGE_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+RANGE_END = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _measure(fn, *, memory: bool):
+    """Run ``fn`` and return (result, seconds, peak_bytes or None)."""
+    gc.collect()
+    if memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _report(name: str, elapsed: float, peak, rows: int):
+    mem = f"{peak / 2**20:9.1f} MiB" if peak is not None else "        —"
+    rate = f"{rows / elapsed:12,.0f} rows/s" if elapsed > 0 else ""
+    print(f"  {name:<28} {elapsed * 1000:10.1f} ms  {mem}  {rate}")
+
+
+def bench_size(size: int, *, seed: int, memory: bool):
+    mod = load_plugin()
+    print(f"\n== {size:,} threads (seed={seed}) ==")
+    t0 = time.perf_counter()
+    docs = make_logs(size, seed=seed)
+    print(f"  generated in {time.perf_counter() - t0:.1f}s, "
+          f"{sum(len(d['messages']) for d in docs):,} messages")
+
+    def query(field):
+        # fresh cog each time so the plugin's range cache doesn't hide the query cost
+        cog, _ = make_cog(FakeCollection(docs))
+        return asyncio.run(cog._query_logs_in_range(RANGE_START, RANGE_END, field=field))
+
+    closed, t, peak = _measure(lambda: query("closed_at"), memory=memory)
+    _report("query closed_at", t, peak, len(closed))
+
+    stats, t, peak = _measure(lambda: [mod.compute_case_stats(d) for d in closed], memory=memory)
+    _report("compute_case_stats", t, peak, len(closed))
+    t_stats = t
+
+    summary, t, peak = _measure(lambda: mod.CaseExporter._calc_summary(stats), memory=memory)
+    _report("_calc_summary", t, peak, len(stats))
+    t_summary = t
+
+    payload, t, peak = _measure(lambda: mod.stats_to_csv(stats), memory=memory)
+    _report("stats_to_csv", t, peak, len(stats))
+    t_csv = t
+
+    _, t, peak = _measure(lambda: mod.aggregate_leaderboard(closed), memory=memory)
+    _report("aggregate_leaderboard", t, peak, len(closed))
+    t_lb = t
+
+    print("  -- command paths (excluding query) --")
+    print(f"  {'cases export (csv)':<28} {(t_stats + t_summary + t_csv) * 1000:10.1f} ms"
+          f"  ({len(payload) / 2**20:.1f} MiB csv)")
+    print(f"  {'cases leaderboard':<28} {t_lb * 1000:10.1f} ms")
+
+    def summary_path():
+        opened = query("created_at")
+        for d in (closed, opened):
+            mod.CaseExporter._calc_summary([mod.compute_case_stats(x) for x in d])
+
+    _, t, peak = _measure(summary_path, memory=memory)
+    _report("cases summary (incl. query)", t, peak, len(closed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,50000",
+                        help="comma-separated thread counts (10k–500k is realistic)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip tracemalloc (faster, timings less perturbed)")
+    args = parser.parse_args()
+    numpy = "yes" if load_plugin().np is not None else "no"
+    print(f"numpy available: {numpy}")
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        bench_size(size, seed=args.seed, memory=not args.no_memory)
+
+
+if __name__ == "__main__":
+    main()
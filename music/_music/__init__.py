@@ -38,6 +38,7 @@ import re as _re
 from .audiotrack import *
 from .exceptions import *
 from ._player import Player
+from .balancer import *
 from .queue import Queue
 from .spotify import *
 from .lyrics import *
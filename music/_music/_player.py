@@ -47,6 +47,7 @@ from core.models import getLogger
 
 from .queue import Queue
 from .audiotrack import LazyAudioTrack
+from .trackcache import TrackCache
 from .exceptions import *
 from .utils import *
 
@@ -59,6 +60,9 @@ class Player(lavalink.BasePlayer):
     """
     Partial rewrite of lavalink's DefaultPlayer.
     """
+    # Shared by all players, the music cog gives it a database on load
+    track_cache = TrackCache()
+
     def __init__(self, guild_id, node):
         super().__init__(guild_id, node)
         self.guild_id: str
@@ -72,6 +76,8 @@ class Player(lavalink.BasePlayer):
         self.queue = Queue(player=self)
 
         self._disconnecting: typing.Optional[asyncio.TimerHandle] = None
+        # humans in the player's voice channel, kept up to date by the music cog, None if not counted yet
+        self.listeners: typing.Optional[int] = None
 
         self._cmd_channel: typing.Optional[TextChannel] = None
         self._playing_message: typing.Optional[Message] = None
@@ -159,11 +165,8 @@ class Player(lavalink.BasePlayer):
     def load_next_few(self) -> None:
         self.queue.load_next_few()
 
-    # Don't want to cache too long, in case there's an update
-    # noinspection PyShadowingNames
-    @cache(100, ignore_kwargs=True, expires_after=21600)  # 6 hours
-    async def req_lavalink_playlist(self, query):
-        logger.debug(f"Fetching playlist {query}")
+    async def _get_tracks(self, query):
+        logger.debug(f"Fetching {query}")
         retry = 3
         while retry > 0:
             resp = await self.node.get_tracks(query)
@@ -175,20 +178,11 @@ class Player(lavalink.BasePlayer):
         # noinspection PyUnboundLocalVariable
         return resp
 
-    # noinspection PyShadowingNames
-    @cache(1000, ignore_kwargs=True, expires_after=86400)  # 1 day
+    async def req_lavalink_playlist(self, query):
+        return await self.track_cache.resolve('playlist', query, self._get_tracks)
+
     async def req_lavalink_track(self, query):
-        logger.debug(f"Fetching track {query}")
-        retry = 3
-        while retry > 0:
-            resp = await self.node.get_tracks(query)
-            if resp and resp.get('loadType') == 'LOAD_FAILED':
-                logger.warning("Failed to fetch track for %s %s retry %s", query, resp, retry)
-                retry -= 1
-                continue
-            break
-        # noinspection PyUnboundLocalVariable
-        return resp
+        return await self.track_cache.resolve('track', query, self._get_tracks)
 
     async def play_next(self, start_time: int = 0, end_time: int = 0, no_replace: bool = False, force: bool = False) \
             -> typing.Optional[LazyAudioTrack]:
@@ -228,6 +222,19 @@ class Player(lavalink.BasePlayer):
                     except discord.HTTPException:
                         logger.debug("Failed to send queue message.")
 
+    async def play_many(self, tracks: typing.List[LazyAudioTrack]) -> None:
+        """
+        Queue a batch of tracks in one step, then start playing or prefetching once for the whole batch.
+        """
+        if not tracks:
+            return
+        self.cancel_tasks()
+        self.queue.extend(tracks)
+        if not self.is_playing_a_track:
+            await self.play_next()
+        else:
+            self.load_next_few()
+
     async def play_previous(self, start_time: int = 0, end_time: int = 0, no_replace: bool = False) \
             -> typing.Optional[LazyAudioTrack]:
         self.cancel_tasks()
@@ -409,6 +416,7 @@ class Player(lavalink.BasePlayer):
             self.queue.repeat = None
             self.playing_message = None
             self._disconnecting = None
+            self.listeners = None
             return
 
         await self._dispatch_voice_update()
@@ -426,6 +434,10 @@ class Player(lavalink.BasePlayer):
         return await super()._dispatch_voice_update()
 
     async def disconnect(self, bot) -> None:
+        # Either the timer fired and a later disconnect_soon may schedule a new one, or it's no longer needed
+        if self._disconnecting:
+            self._disconnecting.cancel()
+            self._disconnecting = None
         if not self.is_connected or self.is_playing_a_track:
             if self.is_playing_a_track:
                 vc = bot.get_channel(int(self.channel_id))
@@ -446,7 +458,6 @@ class Player(lavalink.BasePlayer):
 
         logger.debug("Disconnect %s", self.guild_id)
         # TODO: shard
-        self._disconnecting = None
         # noinspection PyProtectedMember
         ws = bot._connection._get_websocket(int(self.guild_id))
         await ws.voice_state(int(self.guild_id), None)
@@ -460,10 +471,20 @@ class Player(lavalink.BasePlayer):
         )))
 
     def cancel_tasks(self) -> None:
-        if self._disconnecting:
+        # Playing on doesn't help if nobody's listening, keep the pending disconnect then
+        if self._disconnecting and self.listeners != 0:
             self._disconnecting.cancel()
             self._disconnecting = None
 
+    @property
+    def snapshot_key(self) -> tuple:
+        # changes whenever dump() would, apart from the position
+        return (
+            self.queue.snapshot_key, self.channel_id, self.paused, self.volume, tuple(self.equalizer), self.node.name,
+            self._cmd_channel.id if self._cmd_channel else None,
+            self._playing_message.id if self._playing_message else None
+        )
+
     def dump(self, jsonify=False):
         data = dict(
             channel_id=self.channel_id,
@@ -0,0 +1,145 @@
+"""
+As substantial work has been placed—a few months of development—to make this fully featured music bot free for public use, please refrain from discrediting author or falsely claiming this open source work.
+
+BSD 3-Clause License
+
+Copyright (c) 2021, taku#3343 (Discord)
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+   list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+   this list of conditions and the following disclaimer in the documentation
+   and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its
+   contributors may be used to endorse or promote products derived from
+   this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+
+import time
+import typing
+from collections import defaultdict
+
+import lavalink
+
+from core.models import getLogger
+
+__all__ = ['NodeBalancer', 'REBALANCE_INTERVAL']
+
+logger = getLogger(__name__)
+
+REBALANCE_INTERVAL = 60  # Lavalink sends node stats about once a minute
+STATS_SMOOTHING = 0.5  # weight of the newest stats when a node's penalty rises
+PLACEMENT_PENALTY = 1  # a player placed since the last stats, the same as lavalink's penalty per playing player
+OVERLOAD_PENALTY = 300  # roughly 70% system load, or a few percent of frames lost
+MIGRATE_MARGIN = 100  # only migrate to a node this much better, so players don't bounce between similar nodes
+MIGRATIONS_PER_TICK = 2
+MIGRATION_COOLDOWN = 600  # seconds before the same player can be migrated again
+
+
+class NodeBalancer:
+    """
+    Places players on the least loaded Lavalink node and gradually moves them off overloaded nodes.
+
+    Node load is lavalink's stats penalty (playing players, CPU, nulled and missing frames), smoothed when it
+    rises, plus the players placed on the node since its last stats update.
+    """
+    def __init__(self, client: lavalink.Client):
+        self.client = client
+        self._stats: typing.Dict[str, lavalink.Stats] = {}
+        self._penalty: typing.Dict[str, float] = {}
+        self._pending: typing.Dict[str, int] = defaultdict(int)
+        self._migrated_at: typing.Dict[int, float] = {}
+
+    def observe(self) -> None:
+        for node in self.client.node_manager.nodes:
+            stats = node.stats
+            # a new Stats object is made for every stats update
+            if stats is None or self._stats.get(node.name) is stats:
+                continue
+            self._stats[node.name] = stats
+            previous = self._penalty.get(node.name)
+            penalty = stats.penalty.total
+            # a single spike shouldn't move players away, but a recovered node counts as recovered right away
+            if previous is not None and penalty > previous:
+                penalty = STATS_SMOOTHING * penalty + (1 - STATS_SMOOTHING) * previous
+            self._penalty[node.name] = penalty
+            self._pending[node.name] = 0
+
+    def score(self, node: lavalink.Node) -> float:
+        if not node.available or node.name not in self._penalty:
+            return node.penalty
+        return max(self._penalty[node.name] + self._pending[node.name] * PLACEMENT_PENALTY, 0)
+
+    def best_node(self, region: str = None, *, exclude: lavalink.Node = None) -> typing.Optional[lavalink.Node]:
+        self.observe()
+        nodes = [node for node in self.client.node_manager.available_nodes if node is not exclude]
+        regional = [node for node in nodes if node.region == region] if region else []
+        nodes = regional or nodes
+        if not nodes:
+            return None
+        return min(nodes, key=self.score)
+
+    def placed(self, node: lavalink.Node, *, moved_from: lavalink.Node = None) -> None:
+        self._pending[node.name] += 1
+        if moved_from:
+            self._pending[moved_from.name] -= 1
+
+    def _pick_player(self, node: lavalink.Node):
+        now = time.time()
+        players = [player for player in node.players
+                   if now - self._migrated_at.get(player.guild_id, 0) > MIGRATION_COOLDOWN]
+        if not players:
+            return None
+        # idle or paused players first, nobody hears those being moved
+        return min(players, key=lambda player: bool(player.is_playing_a_track) and not player.paused)
+
+    async def rebalance(self) -> int:
+        self.observe()
+        now = time.time()
+        self._migrated_at = {guild_id: at for guild_id, at in self._migrated_at.items()
+                             if now - at <= MIGRATION_COOLDOWN}
+        nodes = self.client.node_manager.available_nodes
+        if len(nodes) < 2:
+            return 0
+
+        moved = 0
+        while moved < MIGRATIONS_PER_TICK:
+            worst = max(nodes, key=self.score)
+            if self.score(worst) < OVERLOAD_PENALTY:
+                break
+            target = self.best_node(worst.region, exclude=worst)
+            if target is None or self.score(worst) - self.score(target) < MIGRATE_MARGIN:
+                break
+            player = self._pick_player(worst)
+            if player is None:
+                break
+
+            logger.info("Moving player %s from node %s (%.0f) to %s (%.0f)", player.guild_id,
+                        worst.name, self.score(worst), target.name, self.score(target))
+            self._migrated_at[player.guild_id] = time.time()
+            self.placed(target, moved_from=worst)
+            # noinspection PyBroadException
+            try:
+                await player.change_node(target)
+            except Exception:
+                logger.warning("Failed to move player %s to node %s", player.guild_id, target.name, exc_info=True)
+            moved += 1
+        return moved
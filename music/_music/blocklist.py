@@ -0,0 +1,275 @@
+"""
+As substantial work has been placed—a few months of development—to make this fully featured music bot free for public use, please refrain from discrediting author or falsely claiming this open source work.
+
+BSD 3-Clause License
+
+Copyright (c) 2021, taku#3343 (Discord)
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+   list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+   this list of conditions and the following disclaimer in the documentation
+   and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its
+   contributors may be used to endorse or promote products derived from
+   this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+
+from collections.abc import MutableSequence
+from itertools import chain
+
+__all__ = ['BlockList']
+
+BLOCK_SIZE = 256
+
+
+class BlockList(MutableSequence):
+    """
+    A list split into blocks of at most ``2 * BLOCK_SIZE`` items.
+
+    Block sizes are kept in a Fenwick tree, so finding a position is O(log n), and inserts / pops only
+    shift the items of one block, so moving or removing tracks in a huge queue doesn't copy the whole queue.
+    Each item is remembered with the block holding it, so ``index`` of an item queued once is fast too.
+    """
+    def __init__(self, iterable=()):
+        self._build(list(iterable))
+
+    def _build(self, items):
+        self._blocks = [items[i:i + BLOCK_SIZE] for i in range(0, len(items), BLOCK_SIZE)]
+        self._len = len(items)
+        self._owner = {}
+        self._refs = {}
+        for block in self._blocks:
+            for item in block:
+                self._remember(item, block)
+        self._restructured()
+
+    def _restructured(self):
+        # rebuilt lazily, so a burst of splits / merges only pays for it once
+        self._tree = None
+        self._block_pos = None
+
+    def _index(self):
+        if self._tree is None:
+            n = len(self._blocks)
+            tree = [0] * (n + 1)
+            for i, block in enumerate(self._blocks, start=1):
+                tree[i] += len(block)
+                parent = i + (i & -i)
+                if parent <= n:
+                    tree[parent] += tree[i]
+            self._tree = tree
+            self._block_pos = {id(block): i for i, block in enumerate(self._blocks)}
+        return self._tree
+
+    def _grow(self, i, delta):
+        tree = self._tree
+        if tree is None:
+            return
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _offset(self, i):
+        tree = self._index()
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("BlockList index out of range")
+        tree = self._index()
+        i = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            if i + step < len(tree) and tree[i + step] <= index:
+                i += step
+                index -= tree[i]
+            step >>= 1
+        return i, index
+
+    def _remember(self, item, block):
+        self._owner[id(item)] = block
+        self._refs[id(item)] = self._refs.get(id(item), 0) + 1
+
+    def _forget(self, item):
+        refs = self._refs.pop(id(item), 1) - 1
+        if refs > 0:
+            self._refs[id(item)] = refs
+        else:
+            self._owner.pop(id(item), None)
+
+    def _split(self, i):
+        block = self._blocks[i]
+        if len(block) <= BLOCK_SIZE * 2:
+            return
+        half = block[BLOCK_SIZE:]
+        del block[BLOCK_SIZE:]
+        self._blocks.insert(i + 1, half)
+        for item in half:
+            self._owner[id(item)] = half
+        self._restructured()
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self)!r})'
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return list(self)[index]
+            items = []
+            if start >= stop:
+                return items
+            i, j = self._locate(start)
+            while len(items) < stop - start:
+                block = self._blocks[i]
+                items.extend(block[j:j + stop - start - len(items)])
+                i += 1
+                j = 0
+            return items
+        i, j = self._locate(index)
+        return self._blocks[i][j]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = value
+            self._build(items)
+            return
+        i, j = self._locate(index)
+        block = self._blocks[i]
+        self._forget(block[j])
+        block[j] = value
+        self._remember(value, block)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                items = list(self)
+                del items[index]
+                self._build(items)
+            elif start < stop:
+                self._delete_range(start, stop)
+            return
+        i, j = self._locate(index)
+        block = self._blocks[i]
+        self._forget(block.pop(j))
+        self._len -= 1
+        if block:
+            self._grow(i, -1)
+        else:
+            del self._blocks[i]
+            self._restructured()
+
+    def _delete_range(self, start, stop):
+        blocks = []
+        offset = 0
+        for block in self._blocks:
+            lo = max(start - offset, 0)
+            hi = min(stop - offset, len(block))
+            offset += len(block)
+            if lo < hi:
+                for item in block[lo:hi]:
+                    self._forget(item)
+                del block[lo:hi]
+            if block:
+                blocks.append(block)
+        self._blocks = blocks
+        self._len -= stop - start
+        self._restructured()
+
+    def insert(self, index, value):
+        if index < 0:
+            index = max(index + self._len, 0)
+        if index >= self._len:
+            self.append(value)
+            return
+        i, j = self._locate(index)
+        block = self._blocks[i]
+        block.insert(j, value)
+        self._remember(value, block)
+        self._len += 1
+        self._grow(i, 1)
+        self._split(i)
+
+    def append(self, value):
+        if not self._blocks:
+            self._blocks.append([])
+            self._restructured()
+        block = self._blocks[-1]
+        block.append(value)
+        self._remember(value, block)
+        self._len += 1
+        self._grow(len(self._blocks) - 1, 1)
+        self._split(len(self._blocks) - 1)
+
+    def extend(self, values):
+        values = list(values)
+        if not values:
+            return
+        n = 0
+        if self._blocks and len(self._blocks[-1]) < BLOCK_SIZE:
+            block = self._blocks[-1]
+            n = BLOCK_SIZE - len(block)
+            block.extend(values[:n])
+            for item in values[:n]:
+                self._remember(item, block)
+        for i in range(n, len(values), BLOCK_SIZE):
+            block = values[i:i + BLOCK_SIZE]
+            self._blocks.append(block)
+            for item in block:
+                self._remember(item, block)
+        self._len += len(values)
+        self._restructured()
+
+    def index(self, value, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(self._len)
+        block = self._owner.get(id(value)) if self._refs.get(id(value)) == 1 else None
+        if block is not None:
+            self._index()
+            i = self._block_pos.get(id(block))
+            if i is not None:
+                offset = self._offset(i)
+                for j, item in enumerate(block):
+                    if item is value and start <= offset + j < stop:
+                        return offset + j
+        # the same item queued more than once, or a lookup by equality
+        for pos, item in enumerate(self[start:stop], start=start):
+            if item is value or item == value:
+                return pos
+        raise ValueError(f'{value!r} is not in BlockList')
+
+    def clear(self):
+        self._build([])
@@ -39,6 +39,7 @@ import json
 import random
 import time
 import typing
+from collections.abc import Sequence
 from typing import List
 
 import lavalink
@@ -46,16 +47,60 @@ import lavalink
 import discord
 
 from .audiotrack import LazyAudioTrack
+from .blocklist import BlockList
 from .exceptions import EndOfQueue, QueueError
 from .utils import *
 
 from core.models import getLogger
 
-__all__ = ['Queue']
+__all__ = ['Queue', 'RenderedQueue']
 
 logger = getLogger(__name__)
 logger.spam = lambda *args, **kwargs: None
 
+PREFETCH_AHEAD = 5  # tracks to resolve past the cursor
+PREFETCH_HEAD = 3  # tracks at the start of the queue, for repeat / back
+PREFETCH_CONCURRENCY = 4  # concurrent track resolves per Lavalink node
+
+TRACKS_PER_PAGE = 10
+RENDER_PREFIX = "```nim\n"
+RENDER_SUFFIX = "\n```"
+
+_node_semaphores: typing.Dict[str, asyncio.Semaphore] = {}
+
+
+def _node_semaphore(node) -> asyncio.Semaphore:
+    # Shared by every player on the node, so a few large imports can't flood its search API
+    try:
+        return _node_semaphores[node.name]
+    except KeyError:
+        semaphore = _node_semaphores[node.name] = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        return semaphore
+
+
+def _escape(line: str) -> str:
+    return line.replace('```', '``\u200b`').replace('@', '@\u200b')
+
+
+class RenderedQueue(Sequence):
+    """
+    Lazy view of a queue's pages, each page is only rendered when accessed.
+    """
+    def __init__(self, queue: 'Queue'):
+        self.queue = queue
+
+    def __len__(self):
+        return max(1, -(-len(self.queue) // TRACKS_PER_PAGE))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+        return self.queue.render_page(index)
+
 
 class Queue:
     def __init__(self, player):
@@ -63,9 +108,15 @@ class Queue:
         self.cursor = 0
 
         self.repeat: typing.Optional[str] = None
-        self._queue: List[LazyAudioTrack] = []
+        self._queue: BlockList = BlockList()
         self._current = None
         self._stopped = True
+        self._prefetch: typing.Optional[asyncio.Task] = None
+
+        # bumped on every change to the order or content of the queue
+        self.version = 0
+        self._page_cache: typing.Dict[int, typing.Tuple[tuple, int, List[str]]] = {}
+        self._page_cache_version = 0
 
         self._last_update = 0
         self._last_position = 0
@@ -79,8 +130,10 @@ class Queue:
         return True
 
     async def clear(self):
+        self._cancel_prefetch()
         self.cursor = 0
         self._queue.clear()
+        self.version += 1
         if self.repeat == 'track':
             self.repeat = None
         self._current = None
@@ -182,33 +235,55 @@ class Queue:
         self._last_position = 0
         self.position_timestamp = 0
 
-    async def _load_next(self, load=5, *, start_from=None) -> int:
+    async def _load_track(self, track: LazyAudioTrack, semaphore: asyncio.Semaphore) -> bool:
+        if track.loaded:
+            return track.success
+        await semaphore.acquire()
+        # shielded so a cancelled prefetch still lets an in-flight request land; the request
+        # keeps its slot until it does, so abandoned loads still count towards the node's limit
+        return await asyncio.shield(self._load_holding(track, semaphore))
+
+    async def _load_holding(self, track: LazyAudioTrack, semaphore: asyncio.Semaphore) -> bool:
+        try:
+            await track.load(self.player)
+        except Exception as e:
+            logger.warning("Unknown error while loading track %s", e)
+            return False
+        finally:
+            semaphore.release()
+        return track.success
+
+    async def _load_next(self, load=PREFETCH_AHEAD, *, start_from=None) -> int:
         cursor = start_from if start_from else \
             (self.cursor + 1 if self.current and self.repeat != 'track' else self.cursor)
+        semaphore = _node_semaphore(self.player.node)
+        head = [track for track in self._queue[:PREFETCH_HEAD] if not track.loaded]
         loaded = 0
 
+        # Resolve in waves of the still missing count; tasks queue on the semaphore in
+        # creation order, so tracks nearest to the cursor go first and the head goes last.
         while loaded < load and cursor < len(self._queue):
-            track = self._queue[cursor]
-            cursor += 1
-            try:
-                await track.load(self.player)
-            except Exception as e:
-                logger.warning("Unknown error while loading track %s", e)
-                continue
-            if track.success:
-                loaded += 1
-
-        for i in range(min(3, len(self._queue))):
-            if not self._queue[i].loaded:
-                try:
-                    await self._queue[i].load(self.player)
-                except Exception as e:
-                    logger.warning("Unknown error while loading music %s", e)
-                    continue
+            batch = self._queue[cursor:cursor + load - loaded]
+            cursor += len(batch)
+            batch_ids = {id(track) for track in batch}
+            extra = [track for track in head if id(track) not in batch_ids]
+            head = []
+            results = await asyncio.gather(*[self._load_track(track, semaphore) for track in batch + extra])
+            loaded += sum(results[:len(batch)])
+
+        if head:
+            await asyncio.gather(*[self._load_track(track, semaphore) for track in head])
         return loaded
 
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch and not self._prefetch.done():
+            self._prefetch.cancel()
+        self._prefetch = None
+
     def load_next_few(self):
-        asyncio.create_task(self._load_next())
+        # A new prefetch supersedes the old one, whose priorities are stale once the cursor moved
+        self._cancel_prefetch()
+        self._prefetch = asyncio.create_task(self._load_next())
 
     async def play_next(self, start_time: int = 0, end_time: int = 0,
                         no_replace: bool = False, force: bool = False) -> LazyAudioTrack:
@@ -247,6 +322,7 @@ class Queue:
                 logger.debug("removing track from queue %s", current)
                 try:
                     self._queue.remove(current)
+                    self.version += 1
                 except ValueError:
                     # not sure why
                     logger.debug("Failed to remove track from queue %s %s", current, self._queue)
@@ -289,6 +365,7 @@ class Queue:
                         logger.debug("Command channel not found.")
                 logger.debug("removing track from queue %s", current)
                 self._queue.remove(current)
+                self.version += 1
             else:
                 playable = True
 
@@ -296,12 +373,19 @@ class Queue:
 
     def add(self, track: LazyAudioTrack) -> None:
         self._queue.append(track)
+        self.version += 1
+
+    def extend(self, tracks: typing.Iterable[LazyAudioTrack]) -> None:
+        self._queue.extend(tracks)
+        self.version += 1
 
     def remove(self, track: LazyAudioTrack) -> None:
         try:
             self._queue.remove(track)
         except ValueError:
             pass
+        else:
+            self.version += 1
 
     async def stop(self) -> None:
         if not self._stopped:
@@ -327,7 +411,10 @@ class Queue:
         await self.player.node._dispatch_event(event)
 
     async def shuffle(self) -> None:
-        random.shuffle(self._queue)
+        tracks = list(self._queue)
+        random.shuffle(tracks)
+        self._queue = BlockList(tracks)
+        self.version += 1
         self.cursor = 0
         paused = self.player.paused
         if self.repeat == 'track':
@@ -367,16 +454,19 @@ class Queue:
             return f"**{self._queue[pos].title}** is already at position **{pos + 1}**!"
 
         self._queue.insert(new_pos, self._queue.pop(pos))
+        self.version += 1
         if self.cursor == pos:
             paused = self.player.paused
             await self.play_current()
             if paused:
                 await self.player.set_pause(True)
 
-        elif pos < self.cursor <= new_pos:
-            self.cursor -= 1
-        elif pos > self.cursor >= new_pos:
-            self.cursor += 1
+        else:
+            if pos < self.cursor <= new_pos:
+                self.cursor -= 1
+            elif pos > self.cursor >= new_pos:
+                self.cursor += 1
+            self.load_next_few()
 
         return self._queue[new_pos], new_pos + 1
 
@@ -401,7 +491,8 @@ class Queue:
     async def remove_range(self, start: int, end: int) -> typing.Union[str, int]:
         if start < 0 or start >= end or end > len(self._queue):
             return "Invalid start / end range!"
-        self._queue = self._queue[:start] + self._queue[end:]
+        del self._queue[start:end]
+        self.version += 1
         diff = max(min(self.cursor - start, end - start), 0)
         removed = start <= self.cursor < end
         if diff:
@@ -416,6 +507,8 @@ class Queue:
             else:
                 if paused:
                     await self.player.set_pause(True)
+        elif self._queue:
+            self.load_next_few()
         return end - start
 
     async def remove_track(self, pos_track_or_range: str) \
@@ -433,6 +526,7 @@ class Queue:
         if pos < 0 or pos >= len(self._queue):
             return f"There's no track at position **{pos + 1}** in queue!"
         removed = self._queue.pop(pos)
+        self.version += 1
         logger.debug("Removing track %s at %s cursor %s", removed, pos, self.cursor)
         if pos == self.cursor:
             paused = self.player.paused
@@ -444,76 +538,102 @@ class Queue:
             else:
                 if paused:
                     await self.player.set_pause(True)
-        elif pos < self.cursor:
-            self.cursor -= 1
+        else:
+            if pos < self.cursor:
+                self.cursor -= 1
+            self.load_next_few()
         return removed, pos + 1
 
-    @property
-    def rendered(self) -> typing.Tuple[typing.List[str], typing.Optional[int]]:
-        prefix = "```nim\n"
-        suffix = "\n```"
-        track_per_page = 10
+    def _current_pos(self) -> typing.Optional[int]:
+        if not self.player.is_playing_a_track:
+            return None
+        if self.cursor < len(self._queue) and self._queue[self.cursor] is self.current:
+            return self.cursor
+        try:
+            return self._queue.index(self.current)
+        except ValueError:
+            return None
 
-        if not self._queue:
-            return [f"{prefix}The queue is empty...{suffix}"], None
+    def _count_length(self, i: int) -> int:
+        total_tracks = len(self._queue)
+        return 1 + (total_tracks >= 10) + (i >= 91 and total_tracks >= 100)
 
-        messages = []
-        current_page = None
+    def _title(self, track: LazyAudioTrack, i: int, block_max_title_length: int) -> str:
+        title_length = min(39 - self._count_length(i), block_max_title_length)
+        return trim(track.title, title_length).ljust(title_length)
 
-        total_tracks = len(self._queue)
+    def render_page(self, page: int) -> str:
+        if not self._queue:
+            return f"{RENDER_PREFIX}The queue is empty...{RENDER_SUFFIX}"
 
-        count_length = 1
-        if total_tracks >= 10:
-            count_length += 1
-
-        for i, track in enumerate(self._queue, start=1):
-            if (i-1) % track_per_page == 0:
-                messages += [""]
-
-            if i == 91 and total_tracks >= 100:
-                count_length += 1
-
-            block_max_title_length = max(30, len(max(
-                self._queue[(i - 1) // track_per_page * track_per_page:
-                            (i - 1) // track_per_page * track_per_page + track_per_page],
-                key=lambda x: len(x.title)).title))
-            title_length = min(39 - count_length, block_max_title_length)
-            title = trim(track.title, title_length).ljust(title_length)
-
-            if track == self.current and self.player.is_playing_a_track:
-                repeat = ' (loop)' if self.repeat == 'track' else ''
-                left = seconds_to_time_string(self.remaining / 1000, int_seconds=True, format=2)
-                messages[-1] += f"{' ' * (count_length + 3)}⬐ current track{repeat}\n" \
-                                f"{i: >{count_length}}) {title} {left} left\n" \
-                                f"{' ' * (count_length + 3)}⬑ current track{repeat}\n"
-                current_page = (i-1) // track_per_page
-            else:
+        if self._page_cache_version != self.version:
+            self._page_cache.clear()
+            self._page_cache_version = self.version
+
+        start = page * TRACKS_PER_PAGE
+        tracks = self._queue[start:start + TRACKS_PER_PAGE]
+        # loading a track changes its title and duration
+        key = tuple(track.loaded for track in tracks)
+        try:
+            cached_key, block_max_title_length, lines = self._page_cache[page]
+        except KeyError:
+            cached_key = None
+        if cached_key != key:
+            block_max_title_length = max(30, max(len(track.title) for track in tracks))
+            lines = []
+            for i, track in enumerate(tracks, start=start + 1):
                 if hasattr(track, 'duration'):
-                    duration = seconds_to_time_string(track.duration / 1000,
-                                                      int_seconds=True, format=2)
+                    duration = seconds_to_time_string(track.duration / 1000, int_seconds=True, format=2)
                 else:
                     duration = "  ???"
-                messages[-1] += f"{i: >{count_length}}) {title} {duration}\n"
-
-            remaining_tracks = total_tracks - i
-            if i % track_per_page == 0 and remaining_tracks > 0:
-                messages[-1] += f"\n{' ' * count_length}{remaining_tracks} more " \
-                                f"{plural(remaining_tracks, show_count=False):track}"
-
-        messages[-1] += "\n"
-        if self.repeat == 'queue':
-            messages[-1] += f"{' ' * (count_length + 2)}This queue is on a loop!"
+                title = self._title(track, i, block_max_title_length)
+                lines.append(_escape(f"{i: >{self._count_length(i)}}) {title} {duration}\n"))
+            self._page_cache[page] = key, block_max_title_length, lines
+
+        # The current track line changes with its progress, so it's never cached
+        current_pos = self._current_pos()
+        if current_pos is not None and start <= current_pos < start + len(tracks):
+            lines = list(lines)
+            i = current_pos + 1
+            count_length = self._count_length(i)
+            title = self._title(self.current, i, block_max_title_length)
+            repeat = ' (loop)' if self.repeat == 'track' else ''
+            left = seconds_to_time_string(self.remaining / 1000, int_seconds=True, format=2)
+            lines[current_pos - start] = _escape(f"{' ' * (count_length + 3)}⬐ current track{repeat}\n"
+                                                 f"{i: >{count_length}}) {title} {left} left\n"
+                                                 f"{' ' * (count_length + 3)}⬑ current track{repeat}\n")
+
+        message = ''.join(lines)
+        last = start + len(tracks)
+        count_length = self._count_length(last)
+        remaining_tracks = len(self._queue) - last
+        if remaining_tracks > 0:
+            message += f"\n{' ' * count_length}{remaining_tracks} more " \
+                       f"{plural(remaining_tracks, show_count=False):track}"
         else:
-            messages[-1] += f"{' ' * (count_length + 2)}This is the end of the queue!"
-        for i in range(len(messages)):
-            messages[i] = prefix + messages[i].replace('```', '``\u200b`').replace('@', '@\u200b') + suffix
-        return messages, current_page
+            message += "\n"
+            if self.repeat == 'queue':
+                message += f"{' ' * (count_length + 2)}This queue is on a loop!"
+            else:
+                message += f"{' ' * (count_length + 2)}This is the end of the queue!"
+        return RENDER_PREFIX + message + RENDER_SUFFIX
+
+    @property
+    def rendered(self) -> typing.Tuple[RenderedQueue, typing.Optional[int]]:
+        current_pos = self._current_pos()
+        current_page = current_pos // TRACKS_PER_PAGE if current_pos is not None else None
+        return RenderedQueue(self), current_page
 
     def __len__(self):
         return len(self._queue)
 
     def __iter__(self):
-        return self._queue.__iter__()
+        return iter(self._queue)
+
+    @property
+    def snapshot_key(self) -> tuple:
+        # changes whenever dump() would, apart from the position
+        return self.version, self.cursor, self.repeat, self._current is not None, self._stopped
 
     def dump(self, jsonify=False):
         tracks = [track.dump() for track in self._queue]
@@ -537,7 +657,7 @@ class Queue:
         self = cls(player)
         self.cursor = data['cursor']
         self.repeat = data['repeat']
-        self._queue = [LazyAudioTrack.load_dump(track) for track in data['tracks']]
+        self._queue = BlockList(LazyAudioTrack.load_dump(track) for track in data['tracks'])
         self._current = self._queue[self.cursor] if data['has_current'] else None
         self._stopped = data['_stopped']
         self._last_position = data['position']
@@ -37,10 +37,122 @@ Partial attribution for this file—"spotify.py" goes to https://github.com/Just
 import asyncio
 import base64
 import time
+import typing
+import urllib.parse
+from collections import deque
 
 from .exceptions import SpotifyError
 
-__all__ = ['Spotify']
+from core.models import getLogger
+
+__all__ = ['Spotify', 'SpotifyCollection']
+
+logger = getLogger(__name__)
+
+PAGE_CONCURRENCY = 4  # concurrent page requests while importing a playlist / album
+TOKEN_EXPIRY_MARGIN = 60  # a token this close to expiring is never handed out
+TOKEN_REFRESH_AHEAD = 300  # refresh in the background this long before the token expires
+
+
+def _song_name(track):
+    # local files and removed tracks come back as null / without artists
+    if not track or not track.get('artists') or not track.get('name'):
+        return None
+    return f"{track['artists'][0]['name']} {track['name']}", track['duration_ms']
+
+
+def _best_image(images):
+    if not images:
+        return None
+    # most square, largest
+    return min(images,
+               key=lambda img: ((abs(img.get('height') or 9999) - (img.get('width') or -99999)),
+                                99999 - (img.get('height') or 1) * (img.get('width') or 1)))['url']
+
+
+class SpotifyCollection:
+    """
+    Tracks of a Spotify link, iterated as batches of ``(title, duration)`` as the pages arrive.
+
+    The first page is fetched up front, the rest are fetched concurrently while iterating.
+    Once fully iterated, the tracks are kept so iterating again doesn't hit Spotify.
+    """
+    def __init__(self, spotify, first_page, *, name=None, link=None, image=None, item_key=None):
+        self.spotify = spotify
+        self.name = name
+        self.link = link
+        self.image = image
+        self.total = first_page.get('total', len(first_page['items']))
+        self._first_page = first_page
+        self._item_key = item_key
+        self._songs = None
+
+    def _parse(self, items):
+        if self._item_key:
+            items = (item.get(self._item_key) for item in items)
+        return [song for song in map(_song_name, items) if song]
+
+    def _page_urls(self):
+        page = self._first_page
+        if not page.get('next') or 'total' not in page:
+            return None
+        limit = page.get('limit') or len(page['items'])
+        url = urllib.parse.urlsplit(page['next'])
+        query = dict(urllib.parse.parse_qsl(url.query))
+        query['limit'] = limit
+        urls = []
+        for offset in range(page.get('offset', 0) + limit, page['total'], limit):
+            query['offset'] = offset
+            urls.append(urllib.parse.urlunsplit(url._replace(query=urllib.parse.urlencode(query))))
+        return urls
+
+    async def _iter_pages(self):
+        yield self._first_page['items']
+        urls = self._page_urls()
+        if urls is None:
+            # no total to plan from, follow the next links one by one
+            page = self._first_page
+            while page.get('next'):
+                page = await self.spotify.make_spotify_req(page['next'])
+                yield page['items']
+            return
+
+        pending = deque()
+        urls = iter(urls)
+        try:
+            while True:
+                # keep a window of requests in flight, but yield pages in order
+                while len(pending) < PAGE_CONCURRENCY:
+                    url = next(urls, None)
+                    if url is None:
+                        break
+                    pending.append(asyncio.create_task(self.spotify.make_spotify_req(url)))
+                if not pending:
+                    return
+                page = await pending.popleft()
+                yield page['items']
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __aiter__(self):
+        if self._songs is not None:
+            if self._songs:
+                yield list(self._songs)
+            return
+
+        songs = []
+        try:
+            async for items in self._iter_pages():
+                batch = self._parse(items)
+                songs += batch
+                if batch:
+                    yield batch
+        except SpotifyError:
+            raise
+        except Exception as e:
+            raise SpotifyError(str(e)) from e
+        self._songs = songs
 
 
 class Spotify:
@@ -52,6 +164,8 @@ class Spotify:
         self.client_id = client_id
         self.client_secret = client_secret
         self.token = None
+        self._token_task: typing.Optional[asyncio.Task] = None
+        self._refresh_handle: typing.Optional[asyncio.TimerHandle] = None
 
     @staticmethod
     def _make_token_auth(client_id, client_secret):
@@ -86,18 +200,52 @@ class Spotify:
     async def get_token(self):
         if self.token and not await self.check_token(self.token):
             return self.token['access_token']
+        token = await self.refresh_token()
+        return token['access_token']
+
+    @staticmethod
+    async def check_token(token):
+        """Whether the token expires soon (or already has) and shouldn't be used anymore."""
+        now = time.time()
+        return token['expires_at'] - now < TOKEN_EXPIRY_MARGIN
+
+    async def refresh_token(self):
+        # Single-flight: everyone asking while a request is out waits on that same request
+        if self._token_task is None or self._token_task.done():
+            self._token_task = asyncio.create_task(self._fetch_token())
+        return await asyncio.shield(self._token_task)
 
+    async def _fetch_token(self):
         token = await self.request_token()
         if token is None:
             raise SpotifyError('Requested a token from Spotify, did not end up getting one')
         token['expires_at'] = time.time() + token['expires_in']
         self.token = token
-        return self.token['access_token']
+        self._schedule_refresh()
+        return token
 
-    @staticmethod
-    async def check_token(token):
-        now = time.time()
-        return token['expires_at'] - now < 60
+    def _schedule_refresh(self):
+        if self._refresh_handle:
+            self._refresh_handle.cancel()
+        delay = max(self.token['expires_at'] - time.time() - TOKEN_REFRESH_AHEAD, 0)
+        self._refresh_handle = self.bot.loop.call_later(delay, self._refresh_in_background)
+
+    def _refresh_in_background(self):
+        self._refresh_handle = None
+
+        def done(task):
+            if not task.cancelled() and task.exception():
+                # the token still has a few minutes left, get_token retries once it's expiring
+                logger.warning("Failed to refresh the Spotify token: %s", task.exception())
+
+        asyncio.ensure_future(self.refresh_token()).add_done_callback(done)
+
+    def close(self):
+        if self._refresh_handle:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
+        if self._token_task and not self._token_task.done():
+            self._token_task.cancel()
 
     async def request_token(self):
         payload = {'grant_type': 'client_credentials'}
@@ -105,46 +253,31 @@ class Spotify:
         r = await self.make_post(self.OAUTH_TOKEN_URL, payload=payload, headers=headers)
         return r
 
-    async def process(self, spotify_link):
+    async def open(self, spotify_link) -> SpotifyCollection:
         spotify_link_parts = spotify_link.split(":")
-        playlist_name = None
-        playlist_link = None
-        image = None
-
-        song_names = []
         try:
             if 'track' in spotify_link_parts:
                 track_resp = await self.get_track(spotify_link_parts[-1])
-                song_names = [(f"{track_resp['artists'][0]['name']} {track_resp['name']}", track_resp['duration_ms'])]
+                return SpotifyCollection(self, {'items': [track_resp]})
 
             elif 'album' in spotify_link_parts:
                 album_resp = await self.get_album(spotify_link_parts[-1])
-                tracks = album_resp['tracks']['items']
-                for track in tracks:
-                    song_names += [(f"{track['artists'][0]['name']} {track['name']}", track['duration_ms'])]
-                playlist_name = album_resp['name']
-                playlist_link = album_resp['external_urls']['spotify']
-                images = album_resp['images']
-                if images:
-                    # most square, largest
-                    image = min(images,
-                                key=lambda img: ((abs(img.get('height') or 9999) - (img.get('width') or -99999)),
-                                                 99999 - (img.get('height') or 1) * (img.get('width') or 1)))['url']
+                return SpotifyCollection(
+                    self, album_resp['tracks'],
+                    name=album_resp['name'],
+                    link=album_resp['external_urls']['spotify'],
+                    image=_best_image(album_resp['images'])
+                )
 
             elif 'playlist' in spotify_link_parts:
                 playlist_resp = await self.get_playlist(spotify_link_parts[-1])
-                tracks = (playlist_resp['tracks'] or {}).get('items', [])
-                for track in tracks:
-                    song_names += [(f"{track['track']['artists'][0]['name']} {track['track']['name']}",
-                                    track['track']['duration_ms'])]
-                playlist_name = playlist_resp['name']
-                playlist_link = playlist_resp['external_urls']['spotify']
-                images = playlist_resp['images']
-                if images:
-                    # most square, largest
-                    image = min(images,
-                                key=lambda img: ((abs(img.get('height') or 9999) - (img.get('width') or -99999)),
-                                                 99999 - (img.get('height') or 1) * (img.get('width') or 1)))['url']
+                return SpotifyCollection(
+                    self, playlist_resp['tracks'] or {'items': []},
+                    name=playlist_resp['name'],
+                    link=playlist_resp['external_urls']['spotify'],
+                    image=_best_image(playlist_resp['images']),
+                    item_key='track'
+                )
 
             else:
                 raise SpotifyError('That is not a supported Spotify URI.')
@@ -152,4 +285,10 @@ class Spotify:
             raise
         except Exception as e:
             raise SpotifyError(str(e)) from e
-        return song_names, playlist_name, playlist_link, image
+
+    async def process(self, spotify_link):
+        collection = await self.open(spotify_link)
+        song_names = []
+        async for batch in collection:
+            song_names += batch
+        return song_names, collection.name, collection.link, collection.image
@@ -0,0 +1,164 @@
+"""
+As substantial work has been placed—a few months of development—to make this fully featured music bot free for public use, please refrain from discrediting author or falsely claiming this open source work.
+
+BSD 3-Clause License
+
+Copyright (c) 2021, taku#3343 (Discord)
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+   list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+   this list of conditions and the following disclaimer in the documentation
+   and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its
+   contributors may be used to endorse or promote products derived from
+   this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+
+import asyncio
+import hashlib
+import typing
+from datetime import datetime, timedelta, timezone
+
+from cachetools import TTLCache
+
+from core.models import getLogger
+
+__all__ = ['TrackCache', 'normalize_query']
+
+logger = getLogger(__name__)
+
+TRACK_CACHE_TTL = 86400 * 7  # 1 week
+PLAYLIST_CACHE_TTL = 21600  # 6 hours, playlists change more often
+TRACK_CACHE_RESULTS = 10  # search results kept per query, as many as `search` shows
+SEARCH_PREFIXES = ('ytsearch:', 'scsearch:')
+CACHED_LOAD_TYPES = {'TRACK_LOADED', 'SEARCH_RESULT', 'PLAYLIST_LOADED'}
+
+
+def normalize_query(query: str) -> str:
+    """Searches are matched case and whitespace insensitively, URLs and identifiers as-is."""
+    query = query.strip()
+    prefix, sep, term = query.partition(':')
+    if sep and f'{prefix.lower()}:' in SEARCH_PREFIXES:
+        return f"{prefix.lower()}:{' '.join(term.casefold().split())}"
+    return query
+
+
+class TrackCache:
+    """
+    Lavalink load results shared by every guild, kept in memory and in the plugin's database.
+
+    Only successful loads are cached, concurrent lookups of the same query share one Lavalink request.
+    """
+    def __init__(self, db=None, *, maxsize=5000):
+        self.db = db
+        self._memory = {
+            'track': TTLCache(maxsize, TRACK_CACHE_TTL),
+            'playlist': TTLCache(max(maxsize // 50, 1), PLAYLIST_CACHE_TTL),
+        }
+        self._ttl = {'track': TRACK_CACHE_TTL, 'playlist': PLAYLIST_CACHE_TTL}
+        self._inflight: typing.Dict[typing.Tuple[str, str], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _doc_id(kind, key):
+        return f"track-cache:{kind}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    async def ensure_indexes(self):
+        if self.db is None:
+            return
+        # documents are dropped by MongoDB once their expires_at has passed
+        # noinspection PyBroadException
+        try:
+            await self.db.create_index('expires_at', expireAfterSeconds=0, name='track_cache_ttl')
+        except Exception:
+            logger.warning("Failed to create the track cache index", exc_info=True)
+
+    async def resolve(self, kind: str, query: str, fetch: typing.Callable[[str], typing.Awaitable[dict]]):
+        key = normalize_query(query)
+        try:
+            result = self._memory[kind][key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            return result
+
+        future = self._inflight.get((kind, key))
+        if future is None:
+            future = self._inflight[kind, key] = asyncio.ensure_future(self._resolve(kind, key, query, fetch))
+            future.add_done_callback(lambda _: self._inflight.pop((kind, key), None))
+        return await asyncio.shield(future)
+
+    async def _resolve(self, kind, key, query, fetch):
+        result = await self._load(kind, key)
+        if result is not None:
+            self.hits += 1
+            self._memory[kind][key] = result
+            return result
+
+        self.misses += 1
+        result = await fetch(query)
+        if not result or result.get('loadType') not in CACHED_LOAD_TYPES or not result.get('tracks'):
+            return result
+
+        if kind == 'track':
+            result = dict(result, tracks=result['tracks'][:TRACK_CACHE_RESULTS])
+        self._memory[kind][key] = result
+        await self._store(kind, key, result)
+        return result
+
+    async def _load(self, kind, key) -> typing.Optional[dict]:
+        if self.db is None:
+            return None
+        # noinspection PyBroadException
+        try:
+            doc = await self.db.find_one({'_id': self._doc_id(kind, key)})
+        except Exception:
+            logger.warning("Failed to read the track cache", exc_info=True)
+            return None
+        if not doc:
+            return None
+        expires_at = doc['expires_at']
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        # the TTL monitor only runs every minute or so
+        if expires_at <= datetime.now(timezone.utc):
+            return None
+        return doc['result']
+
+    async def _store(self, kind, key, result):
+        if self.db is None:
+            return
+        # noinspection PyBroadException
+        try:
+            await self.db.update_one(
+                {'_id': self._doc_id(kind, key)},
+                {'$set': {
+                    'query': key,
+                    'result': result,
+                    'expires_at': datetime.now(timezone.utc) + timedelta(seconds=self._ttl[kind]),
+                }},
+                upsert=True
+            )
+        except Exception:
+            logger.warning("Failed to write the track cache for %s", key, exc_info=True)
@@ -209,7 +209,8 @@ class PaginatorSession:
 
         self.base: typing.Optional[discord.Message] = None
         self.current = 0
-        self.pages = list(pages)
+        # a lazy sequence can be passed as ``pages=`` to avoid building every page up front
+        self.pages = options["pages"] if "pages" in options else list(pages)
         self.destination = options.get("destination", ctx)
         self.reaction_map = {
             "⏮": self.first_page,
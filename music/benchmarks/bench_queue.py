@@ -0,0 +1,111 @@
+"""
+Benchmarks for the queue storage behind the music plugin's `Queue`.
+
+Builds a queue of N placeholder tracks and times the edits that `movequeue`,
+`remove` (single track and range), `jump` and the playback loop do, on the
+previous plain list and on `BlockList`. Each operation is repeated at random
+positions with the same seed for both containers.
+
+`blocklist.py` only needs the standard library, so this runs anywhere:
+
+    python plugins/.../music/benchmarks/bench_queue.py --sizes 10000,100000
+"""
+import argparse
+import importlib.util
+import pathlib
+import random
+import time
+
+BLOCKLIST_PATH = pathlib.Path(__file__).resolve().parent.parent / "_music" / "blocklist.py"
+
+
+def load_blocklist():
+    spec = importlib.util.spec_from_file_location("blocklist", BLOCKLIST_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.BlockList
+
+
+class Track:
+    __slots__ = ('query',)
+
+    def __init__(self, query):
+        self.query = query
+
+
+def _move(tracks, rng, n):
+    for _ in range(n):
+        size = len(tracks)
+        tracks.insert(rng.randrange(size), tracks.pop(rng.randrange(size)))
+
+
+def _remove_pos(tracks, rng, n):
+    for _ in range(n):
+        tracks.pop(rng.randrange(len(tracks)))
+        tracks.append(Track('refill'))
+
+
+def _remove_track(tracks, rng, n):
+    for _ in range(n):
+        track = tracks[rng.randrange(len(tracks))]
+        tracks.remove(track)
+        tracks.append(track)
+
+
+def _jump(tracks, rng, n):
+    for _ in range(n):
+        tracks[rng.randrange(len(tracks))]
+
+
+def _remove_range_list(tracks, rng, n):
+    for _ in range(n):
+        start = rng.randrange(len(tracks) - 10)
+        # what Queue.remove_range did before
+        tracks[:] = tracks[:start] + tracks[start + 10:]
+        tracks.extend(Track('refill') for _ in range(10))
+
+
+def _remove_range(tracks, rng, n):
+    for _ in range(n):
+        start = rng.randrange(len(tracks) - 10)
+        del tracks[start:start + 10]
+        tracks.extend(Track('refill') for _ in range(10))
+
+
+def _time(fn, tracks, *, seed, ops):
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    fn(tracks, rng, ops)
+    return time.perf_counter() - start
+
+
+def run(size, *, seed, ops):
+    BlockList = load_blocklist()
+    print(f"\n{size:,} tracks, {ops:,} ops each (µs/op)")
+    print(f"  {'operation':<14}{'list':>10}{'BlockList':>12}")
+    cases = [
+        ('move', _move, _move),
+        ('remove pos', _remove_pos, _remove_pos),
+        ('remove track', _remove_track, _remove_track),
+        ('remove range', _remove_range_list, _remove_range),
+        ('jump', _jump, _jump),
+    ]
+    for name, list_fn, block_fn in cases:
+        tracks = [Track(f'ytsearch:{i}') for i in range(size)]
+        plain = _time(list_fn, list(tracks), seed=seed, ops=ops)
+        blocked = _time(block_fn, BlockList(tracks), seed=seed, ops=ops)
+        print(f"  {name:<14}{plain / ops * 1e6:>10.2f}{blocked / ops * 1e6:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated queue lengths")
+    parser.add_argument("--ops", type=int, default=2000, help="operations per measurement")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+    for size in (int(s) for s in args.sizes.split(",")):
+        run(size, seed=args.seed, ops=args.ops)
+
+
+if __name__ == "__main__":
+    main()
@@ -36,8 +36,12 @@ OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import asyncio
 import base64
+import gzip
+import itertools
 import json
 import os
+import tempfile
+import threading
 import time
 import typing
 import urllib.parse
@@ -62,6 +66,14 @@ logger.spam = lambda *args, **kwargs: None
 MUSIC_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "music-states")
 if not os.path.exists(MUSIC_STATE_PATH):
     os.mkdir(MUSIC_STATE_PATH)
+SNAPSHOT_INTERVAL = 30  # seconds between state snapshots
+SNAPSHOT_REFRESH = 300  # rewrite unchanged save files this often, so they don't look stale on restart
+IDLE_SWEEP_INTERVAL = 300  # recount listeners of every player this often, in case a voice event was missed
+# The snapshot loop writes from an executor thread and cleanup() writes on unload; don't let them interleave,
+# and don't let a write computed earlier replace or remove a file a newer one already wrote
+_snapshot_lock = threading.Lock()
+_snapshot_generations = itertools.count(1)
+_snapshot_written_generation: typing.Dict[str, int] = {}
 
 
 class music(commands.Cog):
@@ -70,26 +82,39 @@ class music(commands.Cog):
         self._spotify: typing.Optional[Spotify] = None
         self.db = bot.api.get_plugin_partition(self)
         self._lyrics_api: typing.Optional[Lyrics] = None
+        Player.track_cache.db = self.db
 
         if not hasattr(self.bot, 'lavalink'):  # This ensures the client isn't overwritten during cog reloads.
             BOT_ID = int(b64decode(self.bot.token.split(".")[0]).decode())
             self.bot.lavalink = lavalink.Client(BOT_ID, player=Player)
             self.bot.lavalink_saved_states = {}
+            saved_at = {}
             for save_file in os.listdir(MUSIC_STATE_PATH):
                 save_file = os.path.join(MUSIC_STATE_PATH, save_file)
-                if not save_file.endswith('.json'):
+                # .json is the format from before periodic snapshots
+                if not save_file.endswith(('.json', '.json.gz')):
                     continue
                 # noinspection PyBroadException
                 try:
-                    with open(save_file, 'r') as f:
-                        save = json.load(f)
+                    if save_file.endswith('.gz'):
+                        with gzip.open(save_file, 'rt', encoding='utf-8') as f:
+                            save = json.load(f)
+                    else:
+                        with open(save_file, 'r') as f:
+                            save = json.load(f)
                     if time.time() - save['timestamp'] > 1800:
                         logger.error("Save file timestamp older than 30 minutes, ignoring")
                         os.unlink(save_file)
                         continue
+                    if saved_at.get(save['node_name'], 0) > save['timestamp']:
+                        continue
+                    saved_at[save['node_name']] = save['timestamp']
                     save_state = self.bot.lavalink_saved_states[save['node_name']] = {}
 
+                    positions = save.get('positions', {})
                     for gid, data in save['guilds'].items():
+                        if gid in positions:
+                            data['queue']['position'] = positions[gid]
                         save_state[int(gid)] = data
                 except Exception:
                     logger.warning("Failed to load save state %s", save_file, exc_info=True)
@@ -101,6 +126,13 @@ class music(commands.Cog):
                 self.bot.lavalink._session = aiohttp.ClientSession(
                     timeout=aiohttp.ClientTimeout(total=30)
                 )
+        # guild id -> (player snapshot key, dumped player json)
+        self._snapshot_cache: typing.Dict[int, typing.Tuple[tuple, str]] = {}
+        # node name -> (guilds json, positions, written at)
+        self._snapshot_written: typing.Dict[str, typing.Tuple[str, dict, float]] = {}
+
+        self.balancer = NodeBalancer(self.bot.lavalink)
+
         # noinspection PyTypeChecker
         lavalink.add_event_hook(self.track_hook)
         self.bot.loop.create_task(self.cog_load())
@@ -116,6 +148,7 @@ class music(commands.Cog):
         return self._spotify
 
     async def cog_load(self):
+        await Player.track_cache.ensure_indexes()
         config = await self.db.find_one({'_id': 'music-config'})
         if config:
             SPOTIFY_CLIENT_ID = config.get('spotify_client_id')
@@ -190,26 +223,93 @@ class music(commands.Cog):
 
         await self.bot.wait_until_ready()
         self.auto_disconnect.start()
+        self.snapshot_states.start()
+        self.rebalance_nodes.start()
 
-    def cleanup(self):
-        logger.debug("Saving music states...")
-
-        saves = defaultdict(dict)
+    def _snapshot_payloads(self, force: bool = False) -> typing.Dict[str, typing.Optional[str]]:
+        """
+        Save file contents by node name, ``None`` for a save file that should be removed.
 
+        A player is only dumped again when its state changed since the last snapshot, and
+        a node's file is only rewritten when something in it changed.
+        """
+        guilds = defaultdict(list)
+        positions = defaultdict(dict)
+        connected = set()
         for gid, player in self.bot.lavalink.player_manager.players.items():
             player: Player
             if not player.is_connected:
-                logger.info("Skipped saving %s", player)
+                logger.spam("Skipped saving %s", player)
+                continue
+            connected.add(gid)
+            key = player.snapshot_key
+            cached = self._snapshot_cache.get(gid)
+            if cached is None or cached[0] != key:
+                cached = self._snapshot_cache[gid] = key, json.dumps(player.dump())
+            guilds[player.node.name].append(f'{json.dumps(str(gid))}: {cached[1]}')
+            # the position moves on its own, so it's saved next to the player dumps
+            positions[player.node.name][str(gid)] = player.position
+        for gid in self._snapshot_cache.keys() - connected:
+            del self._snapshot_cache[gid]
+
+        now = time.time()
+        payloads = {}
+        for node_name in self._snapshot_written.keys() - guilds.keys():
+            del self._snapshot_written[node_name]
+            payloads[node_name] = None
+        for node_name, node_guilds in guilds.items():
+            guilds_json = '{' + ', '.join(node_guilds) + '}'
+            written = self._snapshot_written.get(node_name)
+            if not force and written and written[0] == guilds_json and written[1] == positions[node_name] \
+                    and now - written[2] < SNAPSHOT_REFRESH:
                 continue
-            data = player.dump()
-            saves[data['node_name']].setdefault('guilds', {})
-            saves[data['node_name']]['guilds'][gid] = data
-        for node_name, save in saves.items():
-            save['timestamp'] = time.time()
-            save['node_name'] = node_name
-            logger.info("Saving lavalink save file for %s", node_name)
-            with open(os.path.join(MUSIC_STATE_PATH, f"{node_name}.json"), 'w') as f:
-                json.dump(save, f, indent=4, sort_keys=True)
+            self._snapshot_written[node_name] = guilds_json, positions[node_name], now
+            payloads[node_name] = f'{{"node_name": {json.dumps(node_name)}, "timestamp": {now!r}, ' \
+                                  f'"positions": {json.dumps(positions[node_name])}, "guilds": {guilds_json}}}'
+        return payloads
+
+    @staticmethod
+    def _write_snapshots(payloads: typing.Dict[str, typing.Optional[str]], generation: int) -> None:
+        with _snapshot_lock:
+            for node_name, payload in payloads.items():
+                if _snapshot_written_generation.get(node_name, 0) > generation:
+                    logger.debug("Skipped outdated snapshot of node %s", node_name)
+                    continue
+                _snapshot_written_generation[node_name] = generation
+                save_file = os.path.join(MUSIC_STATE_PATH, f"{node_name}.json.gz")
+                legacy_file = os.path.join(MUSIC_STATE_PATH, f"{node_name}.json")
+                if os.path.exists(legacy_file):
+                    os.unlink(legacy_file)
+                if payload is None:
+                    if os.path.exists(save_file):
+                        os.unlink(save_file)
+                    continue
+                # Write-then-rename, so a crash mid-write leaves the previous snapshot intact
+                fd, tmp_file = tempfile.mkstemp(prefix=f"{node_name}.", suffix='.tmp', dir=MUSIC_STATE_PATH)
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(gzip.compress(payload.encode('utf-8'), compresslevel=6))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_file, save_file)
+                except BaseException:
+                    os.unlink(tmp_file)
+                    raise
+
+    @tasks.loop(seconds=SNAPSHOT_INTERVAL, reconnect=False)
+    async def snapshot_states(self):
+        # noinspection PyBroadException
+        try:
+            payloads = self._snapshot_payloads()
+            if payloads:
+                logger.spam("Saving music states for %s", list(payloads))
+                await self.bot.loop.run_in_executor(None, self._write_snapshots, payloads, next(_snapshot_generations))
+        except Exception:
+            logger.warning("Failed to snapshot music states", exc_info=True)
+
+    def cleanup(self):
+        logger.debug("Saving music states...")
+        self._write_snapshots(self._snapshot_payloads(force=True), next(_snapshot_generations))
 
         try:
             logger.info("Closing lavalink session.")
@@ -218,20 +318,68 @@ class music(commands.Cog):
         except asyncio.CancelledError:
             pass
 
-    @tasks.loop(seconds=20, reconnect=False)
+    def _count_listeners(self, player: Player, channel: discord.VoiceChannel = None) -> None:
+        channel = channel or self.bot.get_channel(int(player.channel_id))
+        player.listeners = sum(not m.bot for m in channel.members) if channel else None
+
+    def _update_idle(self, player: Player) -> None:
+        if not player.is_connected:
+            return
+        if not player.is_playing_a_track or player.listeners == 0:
+            logger.debug('Auto disconnecting from %s', player.guild_id)
+            player.disconnect_soon(self.bot)
+        else:
+            player.cancel_tasks()
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if before.channel == after.channel:
+            return
+        player: typing.Optional[Player] = self.bot.lavalink.player_manager.get(member.guild.id)
+        if player is None or not player.is_connected:
+            return
+
+        if member.id == self.bot.user.id:
+            # joined or got moved, the player's channel_id might not be updated yet
+            if after.channel:
+                self._count_listeners(player, after.channel)
+        elif member.bot:
+            return
+        elif player.listeners is None:
+            self._count_listeners(player)
+        else:
+            channel_id = int(player.channel_id)
+            if before.channel and before.channel.id == channel_id:
+                player.listeners -= 1
+            if after.channel and after.channel.id == channel_id:
+                player.listeners += 1
+        self._update_idle(player)
+
+    @tasks.loop(seconds=IDLE_SWEEP_INTERVAL, reconnect=False)
     async def auto_disconnect(self):
+        # Disconnects are scheduled from voice state and track events, this only catches what they missed
         for player in self.bot.lavalink.player_manager.players.values():
             player: Player
             if player.is_connected:
-                vc = self.bot.get_channel(int(player.channel_id))
-                if not player.is_playing_a_track or (vc and not any(not m.bot for m in vc.members)):
-                    logger.debug('Auto disconnecting from %s', player.guild_id)
-                    player.disconnect_soon(self.bot)
+                self._count_listeners(player)
+                self._update_idle(player)
             elif player.queue.position_timestamp - time.time() > 30:
                 logger.warning("Idle player, destroy? %s", player)
 
+    @tasks.loop(seconds=REBALANCE_INTERVAL, reconnect=False)
+    async def rebalance_nodes(self):
+        # noinspection PyBroadException
+        try:
+            await self.balancer.rebalance()
+        except Exception:
+            logger.warning("Failed to rebalance lavalink nodes", exc_info=True)
+
     def cog_unload(self):
         self.auto_disconnect.cancel()
+        self.snapshot_states.cancel()
+        self.rebalance_nodes.cancel()
+        if self._spotify:
+            self._spotify.close()
         # noinspection PyProtectedMember
         self.bot.lavalink._event_hooks.clear()
         self.cleanup()
@@ -248,7 +396,15 @@ class music(commands.Cog):
         await self.ensure_voice(ctx)
 
     async def ensure_voice(self, ctx):
-        ctx.player = self.bot.lavalink.player_manager.create(ctx.guild.id, endpoint=str(ctx.guild.region))
+        player_manager = self.bot.lavalink.player_manager
+        if ctx.guild.id in player_manager.players:
+            ctx.player = player_manager.players[ctx.guild.id]
+        else:
+            endpoint = str(ctx.guild.region)
+            node = self.balancer.best_node(self.bot.lavalink.node_manager.get_region(endpoint))
+            ctx.player = player_manager.create(ctx.guild.id, endpoint=endpoint, node=node)
+            if node:
+                self.balancer.placed(node)
         is_universal = ctx.command.qualified_name in {'search', 'lyrics'}
         if is_universal:
             return
@@ -292,9 +448,14 @@ class music(commands.Cog):
             try:
                 logger.debug("Queue ended")
                 player.playing_message = None
+                player.disconnect_soon(self.bot)
             except Exception:
                 logger.warning("Failed to disconnect / schedule clear queue", exc_info=True)
 
+        elif isinstance(event, lavalink.events.TrackEndEvent):
+            if event.reason == 'STOPPED':
+                event.player.disconnect_soon(self.bot)
+
         elif isinstance(event, lavalink.events.WebSocketClosedEvent):
             # Need to handle?
             logger.debug('WS closed %s %s %s', event.by_remote, event.code, event.reason)
@@ -319,9 +480,12 @@ class music(commands.Cog):
                     await asyncio.gather(*[reconnect(gid, data) for gid, data in save.items()])
                 finally:
                     logger.debug("Removing save file for %s", event.node.name)
-                    save_file = os.path.join(MUSIC_STATE_PATH, f"{event.node.name}.json")
-                    if os.path.exists(save_file):
-                        os.unlink(save_file)
+                    for ext in ('.json', '.json.gz'):
+                        save_file = os.path.join(MUSIC_STATE_PATH, f"{event.node.name}{ext}")
+                        if os.path.exists(save_file):
+                            os.unlink(save_file)
+                    # the next snapshot has to write this node's file again
+                    self._snapshot_written.pop(event.node.name, None)
 
     async def connect_to(self, guild_id: int, channel_id: typing.Optional[int]) -> None:
         # noinspection PyProtectedMember
@@ -333,8 +497,8 @@ class music(commands.Cog):
 
     # Don't want to cache too long, in case there's an update
     @utils.cache(500, expires_after=3600)  # 1 hour
-    async def _req_spotify(self, query):
-        return await self.spotify.process(query)
+    async def _req_spotify(self, query) -> SpotifyCollection:
+        return await self.spotify.open(query)
 
     @staticmethod
     def _format_url(music_url):
@@ -486,6 +650,8 @@ class music(commands.Cog):
             SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET = parts
             if not SPOTIFY_CLIENT_ID or not SPOTIFY_CLIENT_SECRET:
                 raise Failure(ctx, "The format for configuring spotify is `SPOTIFY_CLIENT_ID:SPOTIFY_CLIENT_SECRET`.")
+            if self._spotify:
+                self._spotify.close()
             try:
                 self._spotify = Spotify(self.bot, SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET)
                 await self._spotify.get_token()
@@ -583,11 +749,12 @@ class music(commands.Cog):
         if self.spotify and query.startswith('spotify:'):
             logger.spam("Processing spotify")
             try:
-                titles, playlist_name, playlist_link, spotify_image = await self._req_spotify(query)
+                collection = await self._req_spotify(query)
+                titles = [title async for batch in collection for title in batch]
             except SpotifyError as e:
                 logger.debug("Bad spotify %s", e)
                 raise Failure(ctx, "It seems your Spotify link is invalid or is private.")
-            if playlist_name:
+            if collection.name:
                 if not titles:
                     raise Failure(ctx, 'The spotify link is empty!')
                 tracks = [LazyAudioTrack(f'ytsearch:{title}', title, ctx.author.id, duration=duration, spotify=True)
@@ -599,6 +766,8 @@ class music(commands.Cog):
                 session = PaginatorSession(ctx, *pages)
                 return await session.run()
 
+            if not titles:
+                raise Failure(ctx, 'No matches found!')
             track = LazyAudioTrack(f'ytsearch:{titles[0][0]}', titles[0][0], ctx.author.id,
                                    duration=titles[0][1], spotify=True)
             await track.load(player)
@@ -701,28 +870,52 @@ class music(commands.Cog):
         if self.spotify and query.startswith('spotify:'):
             logger.spam("Processing spotify")
             try:
-                titles, playlist_name, playlist_link, spotify_image = await self._req_spotify(query)
+                collection = await self._req_spotify(query)
             except SpotifyError as e:
                 logger.debug("Bad spotify %s", e)
                 raise Failure(ctx, "It seems your Spotify link is invalid or is private.")
-            if playlist_name:
-                if not titles:
+            if collection.name:
+                if not collection.total:
                     raise Failure(ctx, 'The spotify link is empty!')
 
-                embed = discord.Embed(
-                    description=f'Queued {utils.plural(len(titles)):track} from [{playlist_name}]({playlist_link})',
-                    colour=self.bot.main_color
-                )
-
-                if spotify_image:
-                    embed.set_thumbnail(url=spotify_image)
-                await ctx.send(embed=embed)
-                for title, duration in titles:
-                    track = LazyAudioTrack(f'ytsearch:{title}', title, ctx.author.id,
-                                           duration=duration, spotify=True)
-                    await player.play_later(track=track, send_queue_message=False)
-                    tracks += [track]
+                # Queue each page as it arrives, so the first track plays while the rest are still fetched
+                try:
+                    async for titles in collection:
+                        batch = [LazyAudioTrack(f'ytsearch:{title}', title, ctx.author.id,
+                                                duration=duration, spotify=True)
+                                 for title, duration in titles]
+                        await player.play_many(batch)
+                        tracks += batch
+                except SpotifyError as e:
+                    logger.warning("Failed to fetch the rest of %s: %s", query, e)
+                    if not tracks:
+                        raise Failure(ctx, "It seems your Spotify link is invalid or is private.")
+                    embed = discord.Embed(
+                        description=f"Only queued {utils.plural(len(tracks)):track} "
+                                    f"from [{collection.name}]({collection.link}), Spotify failed to send the rest.",
+                        colour=self.bot.error_color
+                    )
+                    await ctx.send(embed=embed)
+                else:
+                    # Local and removed tracks count towards the total but are skipped
+                    if not tracks:
+                        raise Failure(ctx, 'The spotify link is empty!')
+                    embed = discord.Embed(
+                        description=f'Queued {utils.plural(len(tracks)):track} '
+                                    f'from [{collection.name}]({collection.link})',
+                        colour=self.bot.main_color
+                    )
+                    if collection.image:
+                        embed.set_thumbnail(url=collection.image)
+                    await ctx.send(embed=embed)
             else:
+                try:
+                    titles = [title async for batch in collection for title in batch]
+                except SpotifyError as e:
+                    logger.debug("Bad spotify %s", e)
+                    raise Failure(ctx, "It seems your Spotify link is invalid or is private.")
+                if not titles:
+                    raise Failure(ctx, 'No matches found!')
                 track = LazyAudioTrack(f'ytsearch:{titles[0][0]}', titles[0][0], ctx.author.id,
                                        duration=titles[0][1], spotify=True)
                 await player.play_later(track=track)
@@ -758,12 +951,10 @@ class music(commands.Cog):
                         colour=self.bot.main_color
                     )
                     await ctx.send(embed=embed)
-                    for track in result['tracks']:
-                        # noinspection PyTypeChecker
-                        track = LazyAudioTrack.from_loaded(track, ctx.author.id)
-                        await player.play_later(track=track, send_queue_message=False)
-                        if track.success:
-                            loaded_any_song = True
+                    # noinspection PyTypeChecker
+                    batch = [LazyAudioTrack.from_loaded(track, ctx.author.id) for track in result['tracks']]
+                    await player.play_many(batch)
+                    loaded_any_song = any(track.success for track in batch)
                 else:
                     logger.error("Shouldn't be here... %s", query)
                     raise Failure(ctx, "An unknown error has occurred... try again later")
@@ -912,7 +1103,7 @@ class music(commands.Cog):
         pages, current_track = player.queue.rendered
         if len(pages) == 1:
             return await ctx.send(pages[0], allowed_mentions=AllowedMentions.none())
-        session = utils.PaginatorSession(ctx, *pages)
+        session = utils.PaginatorSession(ctx, pages=pages)
         if current_track:
             await session.show_page(current_track)
         await session.run()
@@ -1296,10 +1487,13 @@ class music(commands.Cog):
                         raise Failure(ctx, "Can't fetch lyrics for a playlist...")
 
                     try:
-                        titles, *_ = await self._req_spotify(query)
+                        collection = await self._req_spotify(query)
+                        titles = [title async for batch in collection for title in batch]
                     except SpotifyError as e:
                         logger.debug("Bad spotify %s", e)
                         raise Failure(ctx, "It seems your Spotify link is invalid or is private.")
+                    if not titles:
+                        raise Failure(ctx, "It seems your Spotify link is invalid or is private.")
                     song_name = titles[0][0]
                 else:
                     try:
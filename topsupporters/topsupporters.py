@@ -1,21 +1,306 @@
+import asyncio
 from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
 
 import discord
 from discord.ext import commands
+from pymongo import UpdateOne
 
 from core import checks
-from core.models import PermissionLevel
+from core.models import PermissionLevel, getLogger
 from core.time import UserFriendlyTime
 
+logger = getLogger(__name__)
+
+REPLY_TYPES = ("anonymous", "thread_message")
+# Daily counter documents in the plugin partition, one per (day, staff_id)
+COUNTER_KIND = "supporter_day"
+COUNTER_FIELDS = {"replied": "replied", "closed": "closed", "both": "both"}
+# Counter upserts sent per bulk_write during a backfill
+BACKFILL_BATCH = 1000
+# Max concurrent fetch_user calls when rendering uncached supporters
+FETCH_CONCURRENCY = 5
+
+
+def _replied_ids_expr() -> dict:
+    """Aggregation expression: ids of mods who sent a reply in the log."""
+    replies = {
+        "$filter": {
+            "input": {"$ifNull": ["$messages", []]},
+            "as": "m",
+            "cond": {"$and": [{"$in": ["$$m.type", list(REPLY_TYPES)]}, {"$eq": ["$$m.author.mod", True]}]},
+        }
+    }
+    return {"$setUnion": [{"$map": {"input": replies, "as": "m", "in": "$$m.author.id"}}]}
+
+
+def _closer_id_expr() -> dict:
+    """Aggregation expression: closer id; closer may be a user dict, or a bare id under a legacy key."""
+    closer = {"$ifNull": ["$closer", {"$ifNull": ["$closer_id", "$closed_by"]}]}
+    return {
+        "$let": {
+            "vars": {"c": closer},
+            "in": {"$cond": [{"$eq": [{"$type": "$$c"}, "object"]}, "$$c.id", {"$toString": "$$c"}]},
+        }
+    }
+
+
+def _log_supporters(log: dict) -> Tuple[Set[str], Optional[str]]:
+    """Returns (ids of mods who replied, closer id) for a log document."""
+    replied = set()
+    for x in log.get('messages') or []:
+        if x.get('type') in REPLY_TYPES and x['author']['mod']:
+            replied.add(x['author']['id'])
+    closer_id = None
+    closer = log.get('closer') or log.get('closer_id') or log.get('closed_by')
+    if closer:
+        # If closer is a dict, extract the id
+        if isinstance(closer, dict):
+            closer_id = closer.get('id')
+        else:
+            closer_id = str(closer)
+    return replied, closer_id or None
+
+
+def _day_floor(dt: datetime) -> datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+# Only pull the fields needed to identify supporters
+LOG_PROJECTION = {
+    "_id": 0,
+    "closed_at": 1,
+    "messages.type": 1,
+    "messages.author.id": 1,
+    "messages.author.mod": 1,
+    "closer.id": 1,
+    "closer_id": 1,
+    "closed_by": 1,
+}
+
 
 class TopSupporters(commands.Cog):
     """Sets up top supporters command in Modmail discord"""
     def __init__(self, bot):
         self.bot = bot
+        self.db = bot.plugin_db.get_partition(self)
+
+    async def cog_load(self):
+        try:
+            await self.db.create_index([("kind", 1), ("day", 1)])
+        except Exception:
+            logger.debug("Failed ensuring counter index.", exc_info=True)
+
+    @staticmethod
+    def _supporters_pipeline(match: dict, filter_by: str, exclude_ids: Set[str]) -> List[dict]:
+        """One (staff_id, count) row per supporter; each log counts once per supporter."""
+        parts = []
+        if filter_by in ("replied", "both"):
+            parts.append(_replied_ids_expr())
+        if filter_by in ("closed", "both"):
+            parts.append([_closer_id_expr()])
+        return [
+            {"$match": match},
+            {"$project": {"_id": 0, "ids": {"$setUnion": parts}}},
+            {"$unwind": "$ids"},
+            {"$match": {"ids": {"$nin": [None, ""] + sorted(exclude_ids)}}},
+            {"$group": {"_id": "$ids", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+        ]
+
+    async def _count_supporters(
+        self, start_date: datetime, end_date: datetime, filter_by: str, exclude_ids: Set[str],
+        *, end_inclusive: bool = True,
+    ) -> List[Tuple[str, int]]:
+        """Returns (staff_id, tickets) sorted by count, descending."""
+        match = {
+            "open": False,
+            "closed_at": {"$gte": start_date.isoformat(), ("$lte" if end_inclusive else "$lt"): end_date.isoformat()},
+        }
+        try:
+            rows = await self.bot.api.logs.aggregate(
+                self._supporters_pipeline(match, filter_by, exclude_ids)
+            ).to_list(None)
+            return [(str(r["_id"]), r["count"]) for r in rows]
+        except Exception:
+            logger.debug("Supporter aggregation failed; falling back to projected scan.", exc_info=True)
+
+        logs = await self.bot.api.logs.find(match, LOG_PROJECTION).to_list(None)
+
+        supporters = defaultdict(int)
+
+        for l in logs:
+            replied, closer_id = _log_supporters(l)
+            supporters_involved = set()
+            if filter_by in ("replied", "both"):
+                supporters_involved |= replied
+            if filter_by in ("closed", "both") and closer_id:
+                supporters_involved.add(closer_id)
+            for s in supporters_involved:
+                if s not in exclude_ids:
+                    supporters[s] += 1
+
+        return sorted(supporters.items(), key=lambda kv: kv[1], reverse=True)
+
+    # ---- user resolution ----
+    def _name_index(self) -> Dict[str, int]:
+        """username -> id over the user cache, first match wins like discord.utils.get."""
+        index: Dict[str, int] = {}
+        for user in self.bot.users:
+            index.setdefault(user.name, user.id)
+        return index
+
+    async def _resolve_users(self, user_ids: List[int]) -> Dict[int, discord.User]:
+        """Cached users, plus API fetches for uncached ones with bounded concurrency."""
+        resolved: Dict[int, discord.User] = {}
+        missing = []
+        for uid in user_ids:
+            user = self.bot.get_user(uid)
+            if user:
+                resolved[uid] = user
+            else:
+                missing.append(uid)
+        if not missing:
+            return resolved
+
+        sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+        async def fetch(uid: int):
+            async with sem:
+                try:
+                    return uid, await self.bot.fetch_user(uid)
+                except discord.HTTPException:
+                    return uid, None
+
+        for uid, user in await asyncio.gather(*(fetch(uid) for uid in missing)):
+            if user:
+                resolved[uid] = user
+        return resolved
+
+    # ---- daily counters ----
+    async def _counters_ready(self) -> bool:
+        meta = await self.db.find_one({"_id": "counters_meta"})
+        return bool(meta and meta.get("backfilled_at"))
+
+    async def _sum_counters(self, first_day: datetime, end_day: datetime, filter_by: str) -> Dict[str, int]:
+        """Sum day buckets in [first_day, end_day) for the chosen tally."""
+        field = COUNTER_FIELDS.get(filter_by)
+        totals: Dict[str, int] = defaultdict(int)
+        if field is None:
+            return totals
+        docs = await self.db.find(
+            {"kind": COUNTER_KIND, "day": {"$gte": first_day.strftime("%Y-%m-%d"), "$lt": end_day.strftime("%Y-%m-%d")}},
+            {"_id": 0, "staff_id": 1, field: 1},
+        ).to_list(None)
+        for d in docs:
+            totals[d["staff_id"]] += d.get(field, 0)
+        return totals
+
+    async def _rank(
+        self, start_date: datetime, end_date: datetime, filter_by: str, exclude_ids: Set[str]
+    ) -> List[Tuple[str, int]]:
+        """Rank supporters, summing daily counters for whole days and scanning only partial edge days."""
+        first_full = start_date if start_date == _day_floor(start_date) else _day_floor(start_date) + timedelta(days=1)
+        last_full_end = _day_floor(end_date)
+        if first_full >= last_full_end or not await self._counters_ready():
+            return await self._count_supporters(start_date, end_date, filter_by, exclude_ids)
+
+        head, days, tail = await asyncio.gather(
+            self._count_supporters(start_date, first_full, filter_by, exclude_ids, end_inclusive=False),
+            self._sum_counters(first_full, last_full_end, filter_by),
+            self._count_supporters(last_full_end, end_date, filter_by, exclude_ids),
+        )
+        totals = defaultdict(int, days)
+        for sid, count in head + tail:
+            totals[sid] += count
+        for sid in exclude_ids:
+            totals.pop(sid, None)
+        return sorted(((k, v) for k, v in totals.items() if v), key=lambda kv: kv[1], reverse=True)
+
+    async def _bump_counters(self, log: dict) -> None:
+        """Add one closed log to its day's counters."""
+        closed_at = log.get("closed_at")
+        if not closed_at:
+            return
+        day = str(closed_at)[:10]
+        replied, closer_id = _log_supporters(log)
+        for sid in replied | ({closer_id} if closer_id else set()):
+            await self.db.update_one(
+                {"_id": f"{day}:{sid}"},
+                {
+                    "$set": {"kind": COUNTER_KIND, "day": day, "staff_id": sid},
+                    "$inc": {
+                        "replied": int(sid in replied),
+                        "closed": int(sid == closer_id),
+                        "both": 1,
+                    },
+                },
+                upsert=True,
+            )
+
+    @commands.Cog.listener()
+    async def on_thread_close(self, thread, closer, silent, delete_channel, message, scheduled):
+        try:
+            log = await self.bot.api.logs.find_one(
+                {"channel_id": str(thread.channel.id), "open": False},
+                LOG_PROJECTION,
+                sort=[("closed_at", -1)],
+            )
+            if log:
+                await self._bump_counters(log)
+        except Exception:
+            logger.debug("Failed updating supporter counters on thread close.", exc_info=True)
+
+    async def _backfill_rows(self) -> List[dict]:
+        """Per (day, staff_id) tallies over every closed log."""
+        pipeline = [
+            {"$match": {"open": False, "closed_at": {"$type": "string"}}},
+            {"$project": {
+                "_id": 0,
+                "day": {"$substrBytes": ["$closed_at", 0, 10]},
+                "replied": _replied_ids_expr(),
+                "closer": _closer_id_expr(),
+            }},
+            {"$project": {"day": 1, "replied": 1, "closer": 1, "ids": {"$setUnion": ["$replied", ["$closer"]]}}},
+            {"$unwind": "$ids"},
+            {"$match": {"ids": {"$nin": [None, ""]}}},
+            {"$group": {
+                "_id": {"day": "$day", "staff_id": "$ids"},
+                "replied": {"$sum": {"$cond": [{"$in": ["$ids", "$replied"]}, 1, 0]}},
+                "closed": {"$sum": {"$cond": [{"$eq": ["$ids", "$closer"]}, 1, 0]}},
+                "both": {"$sum": 1},
+            }},
+        ]
+        try:
+            rows = await self.bot.api.logs.aggregate(pipeline).to_list(None)
+            return [
+                {"day": r["_id"]["day"], "staff_id": str(r["_id"]["staff_id"]),
+                 "replied": r["replied"], "closed": r["closed"], "both": r["both"]}
+                for r in rows
+            ]
+        except Exception:
+            logger.debug("Backfill aggregation failed; falling back to projected scan.", exc_info=True)
+
+        tallies: Dict[Tuple[str, str], List[int]] = {}
+        async for log in self.bot.api.logs.find({"open": False}, LOG_PROJECTION):
+            closed_at = log.get("closed_at")
+            if not closed_at:
+                continue
+            day = str(closed_at)[:10]
+            replied, closer_id = _log_supporters(log)
+            for sid in replied | ({closer_id} if closer_id else set()):
+                t = tallies.setdefault((day, sid), [0, 0, 0])
+                t[0] += sid in replied
+                t[1] += sid == closer_id
+                t[2] += 1
+        return [
+            {"day": day, "staff_id": sid, "replied": t[0], "closed": t[1], "both": t[2]}
+            for (day, sid), t in tallies.items()
+        ]
 
     @checks.has_permissions(PermissionLevel.ADMINISTRATOR)
-    @commands.command()
+    @commands.group(invoke_without_command=True)
     async def topsupporters(self, ctx, *, args: str = ""):
         """Retrieves top supporters for the specified time period.
         
@@ -39,6 +324,8 @@ class TopSupporters(commands.Cog):
           ```
           !topsupporters filter_by=both exclude=123456789,username
           ```
+
+        Run `topsupporters backfill` once so whole days are answered from daily counters.
         """
         import re
         async with ctx.typing():
@@ -89,58 +376,72 @@ class TopSupporters(commands.Cog):
             # Parse exclude list
             exclude_ids = set()
             if exclude:
-                for item in exclude.split(","):
-                    item = item.strip()
+                items = [item.strip() for item in exclude.split(",")]
+                names = None
+                for item in items:
                     if item.isdigit():
                         exclude_ids.add(item)
-                    else:
-                        # Try to resolve by name
-                        user = discord.utils.get(self.bot.users, name=item)
-                        if user:
-                            exclude_ids.add(str(user.id))
-
-            # Fetch logs for all closed tickets in a single request
-            logs = await self.bot.api.logs.find({
-                "open": False,
-                "closed_at": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}
-            }).to_list(None)
-
-            supporters = defaultdict(int)
-
-            for l in logs:
-                supporters_involved = set()
-                if filter_by in ("replied", "both"):
-                    for x in l['messages']:
-                        if x.get('type') in ('anonymous', 'thread_message') and x['author']['mod']:
-                            supporters_involved.add(x['author']['id'])
-                if filter_by in ("closed", "both"):
-                    closer = l.get('closer') or l.get('closer_id') or l.get('closed_by')
-                    if closer:
-                        # If closer is a dict, extract the id
-                        if isinstance(closer, dict):
-                            closer_id = closer.get('id')
-                        else:
-                            closer_id = str(closer)
-                        if closer_id:
-                            supporters_involved.add(closer_id)
-                for s in supporters_involved:
-                    if s not in exclude_ids:
-                        supporters[s] += 1
-
-            supporters_keys = sorted(supporters.keys(), key=lambda x: supporters[x], reverse=True)
+                        continue
+                    if names is None:
+                        # Build the name index once, only if a name was given
+                        names = self._name_index()
+                    # Try to resolve by name
+                    uid = names.get(item)
+                    if uid:
+                        exclude_ids.add(str(uid))
+
+            # Whole days come from the daily counters (once backfilled); edges are counted server-side
+            ranked = await self._rank(start_date, end_date, filter_by, exclude_ids)
+
+            users = await self._resolve_users([int(k) for k, _ in ranked])
 
             fmt = ''
             n = 1
-            for k in supporters_keys:
-                u = self.bot.get_user(int(k))
-                if u:
-                    fmt += f'**{n}.** `{u}` - {supporters[k]}\n'
-                    n += 1
+            for k, count in ranked:
+                u = users.get(int(k))
+                fmt += f'**{n}.** `{u or f"Unknown user {k}"}` - {count}\n'
+                n += 1
 
             em = discord.Embed(title='Active Supporters', description=fmt or 'No supporters found.', timestamp=start_date, color=0x7588da)
             em.set_footer(text=f'Since {start_date.strftime("%Y-%m-%d")} to {end_date.strftime("%Y-%m-%d")}' if start or end else 'Since')
             await ctx.send(embed=em)
 
+    @checks.has_permissions(PermissionLevel.ADMINISTRATOR)
+    @topsupporters.command(name="backfill")
+    async def topsupporters_backfill(self, ctx):
+        """Rebuild the daily supporter counters from all closed logs.
+
+        Safe to re-run; counters are overwritten, not added to, and rankings fall back to
+        scanning logs until the rebuild finishes. Threads closed while the backfill runs may
+        need another run to be counted exactly.
+        """
+        async with ctx.typing():
+            started = discord.utils.utcnow()
+            run_id = started.isoformat()
+            rows = await self._backfill_rows()
+            await self.db.update_one({"_id": "counters_meta"}, {"$unset": {"backfilled_at": ""}})
+            ops = [
+                UpdateOne(
+                    {"_id": f"{r['day']}:{r['staff_id']}"},
+                    {"$set": dict(r, kind=COUNTER_KIND, backfill=run_id)},
+                    upsert=True,
+                )
+                for r in rows
+            ]
+            for i in range(0, len(ops), BACKFILL_BATCH):
+                await self.db.bulk_write(ops[i:i + BACKFILL_BATCH], ordered=False)
+            # Counters left over from deleted logs; days from today on may hold fresh thread closes
+            await self.db.delete_many(
+                {"kind": COUNTER_KIND, "backfill": {"$ne": run_id}, "day": {"$lt": started.strftime("%Y-%m-%d")}}
+            )
+            await self.db.update_one(
+                {"_id": "counters_meta"},
+                {"$set": {"backfilled_at": run_id}},
+                upsert=True,
+            )
+        days = len({r["day"] for r in rows})
+        await ctx.send(f"Backfilled {len(rows)} supporter counters across {days} days.")
+
 
 async def setup(bot):
     await bot.add_cog(TopSupporters(bot))
@@ -17,12 +17,15 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import discord, traceback, asyncio
+import discord, traceback, asyncio, functools, hashlib, re, time, unicodedata
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 from discord.ext import commands
 from discord import User
 from core import checks
-from core.models import PermissionLevel
+from core.models import PermissionLevel, getLogger
 
 from mtranslate import translate
 from googletrans import Translator
@@ -39,6 +42,7 @@ except Exception:
         except Exception:
             PaginatorEmbedInterface = None  # type: ignore
 
+logger = getLogger(__name__)
 
 conv = {
     "ab": "Abkhaz",
@@ -227,6 +231,437 @@ conv = {
     "zu": "Zulu"
 }
 
+# Sync backends (mtranslate, sync googletrans builds) run on this many worker threads
+TRANSLATE_WORKERS = 4
+# Max backend calls in flight at once across all commands and threads
+TRANSLATE_CONCURRENCY = 8
+# Seconds before a single backend call is abandoned
+TRANSLATE_TIMEOUT = 10
+# In-process LRU entries kept in front of the persistent cache
+TRANSLATE_CACHE_SIZE = 2048
+# Seconds a persisted translation is kept (Mongo TTL index)
+TRANSLATE_CACHE_TTL = 30 * 24 * 3600
+# Runs of spaces/tabs collapse in cache keys; line breaks are kept since they shape the translation
+_CACHE_KEY_SPACES = re.compile(r'[ \t]+')
+
+
+class TranslationCache:
+    """Two-tier translation cache: an in-process LRU in front of a Mongo store with a TTL.
+
+    Entries are keyed by a hash of the normalized source text and the target language,
+    so the original text is never persisted.
+    """
+
+    def __init__(self, coll, *, size=TRANSLATE_CACHE_SIZE, ttl=TRANSLATE_CACHE_TTL):
+        self.coll = coll
+        self.size = size
+        self.ttl = ttl
+        self._lru = OrderedDict()
+        self.stats = {'memory_hits': 0, 'store_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def key(text, dest):
+        text = unicodedata.normalize('NFC', text).replace('\r\n', '\n').strip()
+        normalized = _CACHE_KEY_SPACES.sub(' ', text)
+        digest = hashlib.sha256(f'{dest}\0{normalized}'.encode('utf-8')).hexdigest()
+        return f'tcache:{digest}'
+
+    async def ensure_index(self):
+        try:
+            await self.coll.create_index('cached_at', expireAfterSeconds=self.ttl)
+        except Exception:
+            logger.debug('Failed ensuring translation cache TTL index.', exc_info=True)
+
+    def _remember(self, key, value):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+
+    async def get(self, text, dest):
+        key = self.key(text, dest)
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return self._lru[key]
+        try:
+            doc = await self.coll.find_one({'_id': key}, {'translated': 1})
+        except Exception:
+            logger.debug('Translation cache lookup failed.', exc_info=True)
+            doc = None
+        if doc and doc.get('translated') is not None:
+            self.stats['store_hits'] += 1
+            self._remember(key, doc['translated'])
+            return doc['translated']
+        self.stats['misses'] += 1
+        return None
+
+    async def put(self, text, dest, translated):
+        key = self.key(text, dest)
+        self._remember(key, translated)
+        try:
+            await self.coll.update_one(
+                {'_id': key},
+                {'$set': {'translated': translated, 'dest': dest, 'cached_at': datetime.now(timezone.utc)}},
+                upsert=True,
+            )
+        except Exception:
+            logger.debug('Translation cache write failed.', exc_info=True)
+
+    async def clear(self):
+        self._lru.clear()
+        await self.coll.delete_many({'_id': {'$regex': '^tcache:'}})
+
+# Consecutive failures that open a backend's circuit, and seconds before it is probed again
+BREAKER_FAILURES = 3
+BREAKER_RESET = 30
+# Smoothing factor for per-backend latency EWMA
+LATENCY_ALPHA = 0.2
+# Hedging: start the next backend once the primary exceeds its p95 latency (bounded below);
+# until enough samples exist, wait HEDGE_DEFAULT_DELAY seconds
+HEDGE_MIN_DELAY = 0.5
+HEDGE_DEFAULT_DELAY = 2.0
+HEDGE_MIN_SAMPLES = 10
+
+
+class TranslationBackend:
+    """A translation provider. Subclasses implement `_translate(text, dest)`.
+
+    Tracks a circuit breaker and latency statistics so the chain can skip a failing
+    provider and decide when to hedge.
+    """
+
+    name = 'backend'
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self.ewma = None
+        self._samples = deque(maxlen=100)
+
+    async def _translate(self, text, dest):
+        raise NotImplementedError
+
+    # ---- circuit breaker ----
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= BREAKER_RESET:
+            return 'half-open'
+        return 'open'
+
+    def available(self):
+        # half-open lets calls through as probes; one success closes the circuit again
+        return self.state != 'open'
+
+    def _record_success(self, elapsed):
+        self.failures = 0
+        self.opened_at = None
+        self.ewma = elapsed if self.ewma is None else LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * self.ewma
+        self._samples.append(elapsed)
+
+    def _record_failure(self):
+        self.failures += 1
+        if self.failures >= BREAKER_FAILURES or self.state == 'half-open':
+            self.opened_at = time.monotonic()
+
+    @property
+    def p95(self):
+        if len(self._samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    async def translate(self, text, dest):
+        start = time.monotonic()
+        try:
+            result = await self._translate(text, dest)
+        except asyncio.CancelledError:
+            # cancelled by a hedge winner; says nothing about this backend's health
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        if not result:
+            self._record_failure()
+            raise ValueError(f'{self.name} returned an empty translation')
+        self._record_success(time.monotonic() - start)
+        return result
+
+
+class GoogletransBackend(TranslationBackend):
+    name = 'googletrans'
+
+    def __init__(self, translator, call):
+        super().__init__()
+        self.translator = translator
+        self.call = call
+
+    async def _translate(self, text, dest):
+        res = await self.call(self.translator.translate, text, dest=dest)
+        if asyncio.iscoroutine(res):
+            res = await asyncio.wait_for(res, TRANSLATE_TIMEOUT)
+        translated = getattr(res, 'text', None)
+        if translated is None:
+            translated = res if isinstance(res, str) else str(res)
+        return translated
+
+
+class MTranslateBackend(TranslationBackend):
+    name = 'mtranslate'
+
+    def __init__(self, call):
+        super().__init__()
+        self.call = call
+
+    async def _translate(self, text, dest):
+        return await self.call(translate, text, dest)
+
+
+class StubBackend(TranslationBackend):
+    """Offline backend for tests: tags text with the target code, with optional delay/failure."""
+
+    name = 'stub'
+
+    def __init__(self, *, delay=0.0, fail=False):
+        super().__init__()
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def _translate(self, text, dest):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('stub backend failure')
+        return f'[{dest}] {text}'
+
+
+class BackendChain:
+    """Tries backends in priority order, skipping ones whose circuit is open.
+
+    With hedging on, the next backend is started when the current one runs past its
+    p95 latency, and whichever succeeds first wins.
+    """
+
+    def __init__(self, backends, *, hedge=True):
+        self.backends = list(backends)
+        self.hedge = hedge
+
+    def _hedge_delay(self, backend):
+        p95 = backend.p95
+        return HEDGE_DEFAULT_DELAY if p95 is None else max(HEDGE_MIN_DELAY, p95)
+
+    async def translate(self, text, dest):
+        candidates = [b for b in self.backends if b.available()]
+        if not candidates:
+            raise RuntimeError('All translation backends are unavailable; try again shortly.')
+
+        running = {}
+        remaining = list(candidates)
+        newest = None
+        last_error = None
+
+        def launch():
+            nonlocal newest
+            newest = remaining.pop(0)
+            running[asyncio.create_task(newest.translate(text, dest))] = newest
+
+        launch()
+        try:
+            while running:
+                timeout = self._hedge_delay(newest) if self.hedge and remaining else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # current backend is slower than usual: fire the next one alongside it
+                    launch()
+                    continue
+                for task in done:
+                    running.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                if not running and remaining:
+                    launch()
+        finally:
+            for task in running:
+                task.cancel()
+        raise last_error or RuntimeError('Translation failed.')
+
+# Longest text sent to a provider in one request (mtranslate uses GET, so stay well under URL limits)
+TRANSLATE_CHUNK_CHARS = 2000
+# Embed description limit we paginate at (Discord allows 4096)
+EMBED_PAGE_CHARS = 4000
+
+_SENTENCE_END = re.compile(r'(?<=[.!?。！？])\s+')
+
+
+def split_text(text, limit=TRANSLATE_CHUNK_CHARS):
+    r"""Split text into chunks of at most `limit` characters on natural boundaries.
+
+    Prefers paragraph breaks, then line breaks, then sentence ends, then spaces, and only
+    hard-cuts words longer than the limit. Returns (chunk, separator) pairs; chunk + separator
+    is never longer than `limit`, and joining them for every pair reproduces the original text:
+
+    >>> split_text('\n!\n..', 3)
+    [('\n!', '\n'), ('..', '')]
+    >>> texts = ('\n!\n..', 'ab\n\n', 'a\n\n\nb c  d', '  x. y.  ', 'abc def', '\n' * 7)
+    >>> all(''.join(c + s for c, s in split_text(t, 3)) == t for t in texts)
+    True
+    >>> all(len(c + s) <= 3 for t in texts for c, s in split_text(t, 3))
+    True
+    """
+    if len(text) <= limit:
+        return [(text, '')]
+
+    def pieces(segment, level):
+        # (piece, trailing separator) at the given boundary level
+        patterns = (re.compile(r'\n\s*\n'), re.compile(r'\n'), _SENTENCE_END, re.compile(r'\s+'))
+        if level >= len(patterns):
+            return [(segment[i:i + limit], '') for i in range(0, len(segment), limit)]
+        out, pos = [], 0
+        for m in patterns[level].finditer(segment):
+            out.append((segment[pos:m.start()], m.group()))
+            pos = m.end()
+        out.append((segment[pos:], ''))
+        result = []
+        for piece, sep in out:
+            if len(piece) > limit:
+                sub = pieces(piece, level + 1)
+                sub[-1] = (sub[-1][0], sub[-1][1] + sep)
+                result.extend(sub)
+            else:
+                result.append((piece, sep))
+        return result
+
+    # Pieces are at most `limit` long, but their separators can push a chunk over it
+    chunks = []
+    current, current_sep = '', ''
+    for piece, sep in pieces(text, 0):
+        if len(current) + len(current_sep) + len(piece) + len(sep) <= limit:
+            current, current_sep = current + current_sep + piece, sep
+            continue
+        if current or current_sep:
+            chunks.append((current, current_sep))
+        current, current_sep = piece, sep
+        while len(current) + len(current_sep) > limit:
+            # Spill an oversized separator into whitespace-only chunks
+            keep = limit - len(current)
+            chunks.append((current, current_sep[:keep]))
+            current, current_sep = '', current_sep[keep:]
+    if current or current_sep:
+        chunks.append((current, current_sep))
+    return chunks
+
+
+def paginate(text, limit=EMBED_PAGE_CHARS):
+    """Split output text into pages that fit a single embed/message, dropping blank ones."""
+    pages = (chunk + sep for chunk, sep in split_text(text, limit)) if text else ()
+    return [page for page in pages if page.strip()]
+
+# Auto-translate: messages arriving in a thread within this many seconds are translated together
+AUTO_TRANSLATE_BATCH_WINDOW = 1.5
+# Flush a batch early once it holds this many messages or characters
+AUTO_TRANSLATE_BATCH_MAX = 10
+AUTO_TRANSLATE_BATCH_CHARS = TRANSLATE_CHUNK_CHARS
+# Joins batched messages; translators leave the marker alone so the result can be split back
+BATCH_DELIMITER = '\n§§§\n'
+BATCH_SPLIT = re.compile(r'\s*§§§\s*')
+
+# Skip auto-translation when the source language is detected at or above this confidence
+DETECT_CONFIDENCE = 0.8
+
+try:
+    # Optional: more accurate offline identification if langid is installed
+    from langid.langid import LanguageIdentifier, model as _langid_model
+    _langid = LanguageIdentifier.from_modelstring(_langid_model, norm_probs=True)
+except Exception:
+    _langid = None
+
+# Scripts that (mostly) identify a single language on their own: (first, last, code)
+_SCRIPT_RANGES = (
+    (0xAC00, 0xD7AF, 'ko'),
+    (0x3040, 0x30FF, 'ja'),
+    (0x0E00, 0x0E7F, 'th'),
+    (0x0590, 0x05FF, 'he'),
+    (0x0370, 0x03FF, 'el'),
+    (0x0900, 0x097F, 'hi'),
+    (0x0600, 0x06FF, 'ar'),
+    (0x4E00, 0x9FFF, 'zh'),
+)
+
+# A few dozen of the most frequent words per language; enough to tell common languages apart
+_STOPWORDS = {
+    'en': "the and is are you to of it that this what for have was with not but can my your i me we do please thanks hello help",
+    'es': "el la los las que de y es en un una por para con no pero mi tu yo hola gracias como esta estoy necesito ayuda",
+    'fr': "le la les des que de et est en un une pour pas mais je tu vous nous avec bonjour merci suis c'est ne aide",
+    'de': "der die das und ist nicht ich du sie wir ein eine mit auf für aber was wie hallo danke bin habe mein hilfe",
+    'it': "il lo la gli che di è un una per non ma io sono con ciao grazie come questo anche mio aiuto",
+    'pt': "o os as que de é um uma para não mas eu você com olá obrigado como estou isso também preciso ajuda",
+    'nl': "de het een en is niet ik je jij wij met op voor maar wat hoe hallo dank ben heb dit mijn hulp",
+    'sv': "och är att det en ett inte jag du vi med på för men vad hur hej tack har som min hjälp",
+    'pl': "w nie jest się że z do jak ale ja ty co dziękuję cześć mam czy proszę pomoc moje",
+    'tr': "ve bir bu da ne için ama ben sen biz mi var yok merhaba teşekkürler nasıl çok yardım",
+    'id': "dan yang di ini itu tidak saya kamu kami dengan untuk ada apa bagaimana terima kasih halo tolong",
+    'ru': "и в не что это я ты мы он она на с как но да нет привет спасибо пожалуйста мне нужна помощь мой",
+    'uk': "і в не що це я ти ми він вона на з як але так ні привіт дякую будь ласка мені потрібна допомога",
+}
+_STOPWORD_SETS = {lang: set(words.split()) for lang, words in _STOPWORDS.items()}
+_WORD_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+
+def detect_language(text):
+    """Best-effort offline language identification.
+
+    Returns (code, confidence) with confidence in [0, 1], or (None, 0.0) if unsure.
+    Uses langid when installed, else script ranges and stopword counts.
+    """
+    if not text or not text.strip():
+        return None, 0.0
+    if _langid is not None:
+        try:
+            code, prob = _langid.classify(text)
+            return code, float(prob)
+        except Exception:
+            pass
+
+    letters = [ch for ch in text if ch.isalpha()]
+    if not letters:
+        return None, 0.0
+    counts = {}
+    for ch in letters:
+        cp = ord(ch)
+        for first, last, code in _SCRIPT_RANGES:
+            if first <= cp <= last:
+                counts[code] = counts.get(code, 0) + 1
+                break
+    if counts:
+        # Japanese mixes kana with Han characters
+        if counts.get('ja') and counts.get('zh'):
+            counts['ja'] += counts.pop('zh')
+        code, n = max(counts.items(), key=lambda kv: kv[1])
+        share = n / len(letters)
+        if share >= 0.5:
+            # Arabic script also covers Persian/Urdu, so trust it a bit less
+            return code, share * (0.85 if code == 'ar' else 0.98)
+
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return None, 0.0
+    scores = sorted(
+        ((sum(w in stop for w in words), lang) for lang, stop in _STOPWORD_SETS.items()),
+        reverse=True,
+    )
+    (best, lang), (second, _) = scores[0], scores[1]
+    if not best:
+        return None, 0.0
+    # Margin over the runner-up, damped until there are a few stopword hits to go on
+    confidence = (best - second) / best * min(1.0, best / 2.0)
+    return lang, confidence
+
+
 class Translate(commands.Cog):
     """ translate text from one language to another """
     def __init__(self, bot):
@@ -235,6 +670,19 @@ class Translate(commands.Cog):
         self.mod_color = discord.Colour(0x7289da) ## blurple
         self.db = bot.plugin_db.get_partition(self)
         self.translator = Translator()
+        # Keep blocking HTTP calls off the event loop, bounded so a slow provider can't pile up threads
+        self._executor = ThreadPoolExecutor(max_workers=TRANSLATE_WORKERS, thread_name_prefix='translate')
+        self._translate_sem = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+        self.cache = TranslationCache(self.db)
+        self.backends = BackendChain([
+            GoogletransBackend(self.translator, self._call_backend),
+            MTranslateBackend(self._call_backend),
+        ])
+        # Auto-translate micro-batching: channel id -> pending texts / scheduled flush
+        self._pending = {}
+        self._flush_tasks = {}
+        # Last confidently detected source language per thread channel id
+        self._thread_lang = {}
         # Auto-translate mapping per thread channel id -> language code
         self.tt = {}
         self.enabled = True
@@ -294,26 +742,120 @@ class Translate(commands.Cog):
         stored = config.get('auto-translate', {})
         # Normalize to int keys internally
         self.tt = self._deserialize_tt(stored)
+        if not isinstance(stored, dict):
+            # Legacy list (or junk): rewrite once as a mapping so per-key updates work
+            await self.db.update_one({'_id': 'config'}, {'$set': {'auto-translate': self._serialize_tt()}}, upsert=True)
+        await self.cache.ensure_index()
+        await self._prune_tt()
+
+    async def _set_thread_lang(self, ch_id, lang_code):
+        """Enable/update auto-translate for one thread; writes only that key."""
+        self.tt[ch_id] = lang_code
+        await self.db.update_one({'_id': 'config'}, {'$set': {f'auto-translate.{ch_id}': lang_code}}, upsert=True)
+
+    async def _unset_threads(self, *ch_ids):
+        """Disable auto-translate for the given threads; writes only their keys."""
+        for ch_id in ch_ids:
+            self.tt.pop(ch_id, None)
+            self._thread_lang.pop(ch_id, None)
+        if ch_ids:
+            await self.db.update_one(
+                {'_id': 'config'}, {'$unset': {f'auto-translate.{ch_id}': '' for ch_id in ch_ids}}
+            )
+
+    async def _prune_tt(self):
+        """Drop auto-translate entries whose thread channels no longer exist.
+
+        Only runs when the modmail guild is available; otherwise its channels aren't cached yet
+        and the on_thread_close/on_guild_channel_delete listeners handle cleanup instead.
+        """
+        await self.bot.wait_until_ready()
+        guild = self.bot.modmail_guild
+        if guild is None or guild.unavailable:
+            return
+        stale = [ch_id for ch_id in list(self.tt) if guild.get_channel(ch_id) is None]
+        if stale:
+            await self._unset_threads(*stale)
+
+    @commands.Cog.listener()
+    async def on_thread_close(self, thread, *args):
+        ch_id = getattr(getattr(thread, 'channel', None), 'id', None)
+        if ch_id in self.tt:
+            await self._unset_threads(ch_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        if channel.id in self.tt:
+            await self._unset_threads(channel.id)
+
+    def cog_unload(self):
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _call_backend(self, func, *args, **kwargs):
+        """Run a translation backend call with a concurrency limit and timeout.
+
+        Coroutine functions are awaited directly; sync ones run on the plugin's thread pool.
+        Raises asyncio.TimeoutError if the call takes longer than TRANSLATE_TIMEOUT.
+        """
+        async with self._translate_sem:
+            if asyncio.iscoroutinefunction(func):
+                return await asyncio.wait_for(func(*args, **kwargs), TRANSLATE_TIMEOUT)
+            loop = asyncio.get_running_loop()
+            call = functools.partial(func, *args, **kwargs)
+            return await asyncio.wait_for(loop.run_in_executor(self._executor, call), TRANSLATE_TIMEOUT)
 
     async def _translate_text(self, text, dest=None):
-        """Translate text using googletrans; if the method is async, await it.
-        Falls back to mtranslate on failure. Returns the translated string.
+        """Translate text, serving repeats from the translation cache.
+        Returns the translated string.
         """
-        try:
-            res = self.translator.translate(text, dest=dest) if dest else self.translator.translate(text)
-            if asyncio.iscoroutine(res):
-                res = await res
-            translated = getattr(res, 'text', None)
-            if translated is None:
-                translated = res if isinstance(res, str) else str(res)
-            return translated
-        except Exception:
-            # Fallback to mtranslate with a safe default
-            try:
-                code = dest or 'en'
-                return translate(text, code)
-            except Exception:
-                raise
+        code = dest or 'en'
+        if not text.strip():
+            return text
+        if len(text) > TRANSLATE_CHUNK_CHARS:
+            # Long text: translate provider-sized chunks concurrently and reassemble in order
+            chunks = split_text(text)
+            parts = await asyncio.gather(*(self._translate_text(chunk, code) for chunk, _ in chunks))
+            return ''.join(part + sep for part, (_, sep) in zip(parts, chunks))
+        cached = await self.cache.get(text, code)
+        if cached is not None:
+            return cached
+        translated = await self._translate_uncached(text, dest)
+        if translated:
+            await self.cache.put(text, code, translated)
+        return translated
+
+    async def _translate_batch(self, texts, dest):
+        """Translate several texts with a single backend call where possible.
+
+        Cached texts are served from the cache; the rest are joined with BATCH_DELIMITER,
+        translated once and split back. If the split doesn't line up, each text is
+        translated on its own. Returns translations in input order.
+        """
+        results = [await self.cache.get(text, dest) for text in texts]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if not missing:
+            return results
+        joined = BATCH_DELIMITER.join(texts[i] for i in missing)
+        if len(missing) > 1 and len(joined) <= TRANSLATE_CHUNK_CHARS:
+            translated = await self._translate_uncached(joined, dest)
+            parts = BATCH_SPLIT.split(translated.strip()) if translated else []
+            if len(parts) == len(missing):
+                for i, part in zip(missing, parts):
+                    results[i] = part
+                    await self.cache.put(texts[i], dest, part)
+                return results
+        singles = await asyncio.gather(*(self._translate_text(texts[i], dest) for i in missing))
+        for i, part in zip(missing, singles):
+            results[i] = part
+        return results
+
+    async def _translate_uncached(self, text, dest=None):
+        """Translate text through the backend chain (googletrans, then mtranslate).
+        Returns the translated string.
+        """
+        return await self.backends.translate(text, dest or 'en')
 
 
     # +------------------------------------------------------------+
@@ -339,6 +881,8 @@ class Translate(commands.Cog):
                     • `{prefix}tr langs [page]`                  → Show all supported languages (sorted, paginated)
                     • `{prefix}tr auto-thread`                   → Toggle this thread in auto-translate list
                     • `{prefix}tr toggle-auto <true|false>`      → Enable/disable auto-translate globally
+                    • `{prefix}tr cache [clear]`                 → Translation cache stats (or clear it)
+                    • `{prefix}tr backends`                      → Translation backend health
 
                 Related commands:
                     • `{prefix}t <language> <text>`              → Quick translate
@@ -384,7 +928,7 @@ class Translate(commands.Cog):
             return
 
         try:
-            translated = translate(text, lang_code)
+            translated = await self._translate_text(text, lang_code)
         except Exception as e:
             await ctx.send(f"⚠️ Translation failed: {e}", delete_after=20)
             return
@@ -434,13 +978,12 @@ class Translate(commands.Cog):
         except Exception:
             pass
         try:
-            translated = translate(text, lang_code)
+            translated = await self._translate_text(text, lang_code)
         except Exception as e:
             await ctx.send(f"⚠️ Translation failed: {e}", delete_after=20)
             return
-        if len(translated) > 2000:
-            translated = translated[:2000] + "..."
-        await ctx.send(translated, delete_after=360)
+        for page in paginate(translated, 2000):
+            await ctx.send(page, delete_after=360)
 
     # +------------------------------------------------------------+
     # |                   Available Langs                          |
@@ -526,6 +1069,8 @@ class Translate(commands.Cog):
                 f"• `{prefix}tr langs [page]` — Show all supported languages (sorted, paginated)\n"
                 f"• `{prefix}tr auto-thread` — Toggle this thread in auto-translate list\n"
                 f"• `{prefix}tr toggle-auto <true|false>` — Enable/disable auto-translate globally\n"
+                f"• `{prefix}tr cache [clear]` — Translation cache stats (or clear it)\n"
+                f"• `{prefix}tr backends` — Translation backend health\n"
             ),
             inline=False,
         )
@@ -588,13 +1133,12 @@ class Translate(commands.Cog):
             pass
 
         try:
-            translated = translate(text, lang_code)
+            translated = await self._translate_text(text, lang_code)
         except Exception as e:
             await ctx.send(f"⚠️ Translation failed: {e}", delete_after=20)
             return
-        if len(translated) > 2000:
-            translated = translated[:2000] + "..."
-        await ctx.send(translated, delete_after=360)
+        for page in paginate(translated, 2000):
+            await ctx.send(page, delete_after=360)
 
     # +------------------------------------------------------------+
     # |           tr message (subcommand)                         |
@@ -606,10 +1150,11 @@ class Translate(commands.Cog):
         Usage: {prefix}tr message <text>
         """
         tmsg = await self._translate_text(message, dest='en')
-        em = discord.Embed()
-        em.color = 4388013
-        em.description = tmsg
-        await ctx.channel.send(embed=em)
+        for page in paginate(tmsg):
+            em = discord.Embed()
+            em.color = 4388013
+            em.description = page
+            await ctx.channel.send(embed=em)
 
     # +------------------------------------------------------------+
     # |           tr messageid (subcommand)                        |
@@ -653,10 +1198,19 @@ class Translate(commands.Cog):
 
         em = discord.Embed(color=4388013)
         em.add_field(name="Original", value=text if len(text) < 1000 else text[:1000] + '…', inline=False)
-        em.add_field(name=f"Translated ({conv.get(lang_code, lang_code)})", value=translated if len(translated) < 1000 else translated[:1000] + '…', inline=False)
         guild_icon = self._get_guild_icon(ctx.guild)
         em.set_footer(text="Translated via message ID", icon_url=guild_icon)
+        if len(translated) < 1000:
+            em.add_field(name=f"Translated ({conv.get(lang_code, lang_code)})", value=translated, inline=False)
+            await ctx.channel.send(embed=em)
+            return
+        # Long translation: continue in follow-up embeds rather than cutting it off
         await ctx.channel.send(embed=em)
+        for page in paginate(translated):
+            page_em = discord.Embed(color=4388013, description=page)
+            page_em.set_author(name=f"Translated ({conv.get(lang_code, lang_code)})")
+            page_em.set_footer(text="Translated via message ID", icon_url=guild_icon)
+            await ctx.channel.send(embed=page_em)
 
     # +------------------------------------------------------------+
     # |     tr auto-thread & tr toggle-auto (subcommands)         |
@@ -675,6 +1229,53 @@ class Translate(commands.Cog):
         """Toggle global auto-translate on/off (subcommand wrapper)."""
         await self.toggle_auto_translations(ctx, enabled)
 
+    # +------------------------------------------------------------+
+    # |              tr cache (subcommand)                         |
+    # +------------------------------------------------------------+
+    @tr.group(name="cache", invoke_without_command=True, help="Show translation cache statistics.")
+    @checks.has_permissions(PermissionLevel.SUPPORTER)
+    async def tr_cache(self, ctx):
+        """Show translation cache hit/miss counters since the plugin was loaded.
+
+        Usage: {prefix}tr cache
+        """
+        stats = self.cache.stats
+        lookups = sum(stats.values())
+        hit_rate = (stats['memory_hits'] + stats['store_hits']) * 100.0 / lookups if lookups else 0.0
+        em = discord.Embed(color=4388013, title="Translation Cache")
+        em.add_field(name="Memory hits", value=str(stats['memory_hits']))
+        em.add_field(name="Store hits", value=str(stats['store_hits']))
+        em.add_field(name="Misses", value=str(stats['misses']))
+        em.add_field(name="Hit rate", value=f"{hit_rate:.0f}%")
+        em.add_field(name="In memory", value=f"{len(self.cache._lru)}/{self.cache.size}")
+        em.set_footer(text=f"Entries expire after {self.cache.ttl // 86400} days")
+        await ctx.send(embed=em)
+
+    @tr_cache.command(name="clear", help="Clear the translation cache.")
+    @checks.has_permissions(PermissionLevel.ADMINISTRATOR)
+    async def tr_cache_clear(self, ctx):
+        """Drop all cached translations (memory and database)."""
+        await self.cache.clear()
+        await ctx.send("Translation cache cleared.")
+
+    @tr.command(name="backends", help="Show translation backend health.")
+    @checks.has_permissions(PermissionLevel.SUPPORTER)
+    async def tr_backends(self, ctx):
+        """Show circuit state and latency for each translation backend, in priority order.
+
+        Usage: {prefix}tr backends
+        """
+        em = discord.Embed(color=4388013, title="Translation Backends")
+        for backend in self.backends.backends:
+            ewma = f"{backend.ewma * 1000:.0f} ms" if backend.ewma is not None else "—"
+            p95 = f"{backend.p95 * 1000:.0f} ms" if backend.p95 is not None else "—"
+            em.add_field(
+                name=backend.name,
+                value=f"Circuit: {backend.state}\nLatency (EWMA): {ewma}\np95: {p95}",
+            )
+        em.set_footer(text=f"Hedging {'on' if self.backends.hedge else 'off'}")
+        await ctx.send(embed=em)
+
     # +------------------------------------------------------------+
     # |              Translate Message with ID                     |
     # +------------------------------------------------------------+
@@ -685,9 +1286,6 @@ class Translate(commands.Cog):
         Usage: {prefix}tt <text>
         """
         tmsg = await self._translate_text(message, dest='en')
-        em = discord.Embed()
-        em.color = 4388013
-        em.description = tmsg
         # Footer small icon = server icon
         try:
             guild_icon = ctx.guild.icon.url
@@ -695,8 +1293,14 @@ class Translate(commands.Cog):
             guild_icon = getattr(getattr(ctx.guild, 'icon', None), 'url', None) if ctx.guild else None
             if not guild_icon:
                 guild_icon = getattr(ctx.guild, 'icon_url', None) if ctx.guild else None
-        em.set_footer(text="Translated to English", icon_url=guild_icon)
-        await ctx.channel.send(embed=em)
+        pages = paginate(tmsg)
+        for n, page in enumerate(pages, start=1):
+            em = discord.Embed()
+            em.color = 4388013
+            em.description = page
+            footer = "Translated to English" if len(pages) == 1 else f"Translated to English ({n}/{len(pages)})"
+            em.set_footer(text=footer, icon_url=guild_icon)
+            await ctx.channel.send(embed=em)
 
     # +------------------------------------------------------------+
     # |                 Auto Translate Text                        |
@@ -719,8 +1323,7 @@ class Translate(commands.Cog):
         # Disable keywords
         if language and language.lower() in {"off", "disable", "disabled", "false", "none"}:
             if ch_id in self.tt:
-                self.tt.pop(ch_id, None)
-                await self.db.update_one({'_id': 'config'}, {'$set': {'auto-translate': self._serialize_tt()}}, upsert=True)
+                await self._unset_threads(ch_id)
                 await ctx.send("Removed channel from Auto Translations list.")
             else:
                 await ctx.send("Auto Translations were not enabled for this thread.")
@@ -729,13 +1332,11 @@ class Translate(commands.Cog):
         if not language:
             # Toggle behavior if no language passed
             if ch_id in self.tt:
-                self.tt.pop(ch_id, None)
-                await self.db.update_one({'_id': 'config'}, {'$set': {'auto-translate': self._serialize_tt()}}, upsert=True)
+                await self._unset_threads(ch_id)
                 await ctx.send("Removed channel from Auto Translations list.")
             else:
                 # Default to English if enabling without a language
-                self.tt[ch_id] = 'en'
-                await self.db.update_one({'_id': 'config'}, {'$set': {'auto-translate': self._serialize_tt()}}, upsert=True)
+                await self._set_thread_lang(ch_id, 'en')
                 await ctx.send("Added channel to Auto Translations list. Language set to English.")
             return
 
@@ -751,8 +1352,7 @@ class Translate(commands.Cog):
             return
 
         # Enable/update mapping
-        self.tt[ch_id] = lang_code
-        await self.db.update_one({'_id': 'config'}, {'$set': {'auto-translate': self._serialize_tt()}}, upsert=True)
+        await self._set_thread_lang(ch_id, lang_code)
         await ctx.send(f"Auto-translate enabled for this thread → {conv[lang_code]} ({lang_code}).")
     
     # +------------------------------------------------------------+
@@ -821,7 +1421,7 @@ class Translate(commands.Cog):
         Example: {prefix}attr English Hello, how are you?
         """
         lang_code = self._resolve_lang_code(language)
-        translated = translate(message, lang_code)
+        translated = await self._translate_text(message, lang_code)
 
         # Send internal embed for staff (bot message, typically not relayed)
         em = discord.Embed(color=self.mod_color)
@@ -855,7 +1455,7 @@ class Translate(commands.Cog):
         else:
             language = language_or_message or 'en'
         lang_code = self._resolve_lang_code(language)
-        translated = translate(message, lang_code)
+        translated = await self._translate_text(message, lang_code)
         await self._invoke_reply(ctx, translated, anonymous=False)
 
     @commands.command(name='trar')
@@ -874,7 +1474,7 @@ class Translate(commands.Cog):
         else:
             language = language_or_message or 'en'
         lang_code = self._resolve_lang_code(language)
-        translated = translate(message, lang_code)
+        translated = await self._translate_text(message, lang_code)
         await self._invoke_reply(ctx, translated, anonymous=True)
     
     @commands.Cog.listener()
@@ -940,24 +1540,86 @@ class Translate(commands.Cog):
         msg = emb0.description
         if not msg:
             return
+        # Skip the remote call when the user already writes in the thread's target language
+        if self._already_in_target(channel.id, msg, self.tt.get(channel.id, 'en')):
+            return
+        self._queue_auto_translation(channel, msg)
+
+    # +------------------------------------------------------------+
+    # |            Auto-translate micro-batching                   |
+    # +------------------------------------------------------------+
+    def _already_in_target(self, channel_id, text, target):
+        """Whether text is (confidently) already in the target language.
+
+        Short or ambiguous messages ("ok", "thanks!") fall back to the thread's last
+        confident detection.
+        """
+        lang, confidence = detect_language(text)
+        if lang and confidence >= DETECT_CONFIDENCE:
+            self._thread_lang[channel_id] = lang
+            return lang == target
+        return self._thread_lang.get(channel_id) == target
+
+    def _queue_auto_translation(self, channel, text):
+        """Buffer a thread message; the batch is flushed after a short quiet window or when full."""
+        pending = self._pending.setdefault(channel.id, [])
+        pending.append(text)
+        full = (
+            len(pending) >= AUTO_TRANSLATE_BATCH_MAX
+            or sum(len(t) for t in pending) >= AUTO_TRANSLATE_BATCH_CHARS
+        )
+        task = self._flush_tasks.get(channel.id)
+        if full:
+            if task:
+                task.cancel()
+            self._flush_tasks[channel.id] = asyncio.create_task(self._flush_auto_translation(channel, 0))
+        elif task is None:
+            self._flush_tasks[channel.id] = asyncio.create_task(
+                self._flush_auto_translation(channel, AUTO_TRANSLATE_BATCH_WINDOW)
+            )
+
+    async def _flush_auto_translation(self, channel, delay):
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        if self._flush_tasks.get(channel.id) is asyncio.current_task():
+            self._flush_tasks.pop(channel.id, None)
+        texts = self._pending.pop(channel.id, [])
+        if not texts:
+            return
         # Translate to the configured language code for this thread
         lang_code = self.tt.get(channel.id, 'en')
-        translated = await self._translate_text(msg, dest=lang_code)
-        if not translated:
-            return
-        # Post a simple embed containing only the translated text
-        # Truncate safely under embed description limit (~4096)
-        desc = translated if len(translated) <= 4000 else translated[:3997] + '...'
-        em = discord.Embed(description=desc, color=4388013)
-        # Footer token prevents our listener from translating our own embeds again
+        try:
+            translations = await self._translate_batch(texts, lang_code)
+        except Exception:
+            logger.debug('Auto-translate failed for channel %s.', channel.id, exc_info=True)
+            return
+        translations = [t for t in translations if t]
+        if not translations:
+            return
+        # Post simple embeds containing only the translated text, one paragraph per message
+        translated = '\n\n'.join(translations)
         try:
             guild_icon = channel.guild.icon.url
         except AttributeError:
             guild_icon = getattr(getattr(channel.guild, 'icon', None), 'url', None) if getattr(channel, 'guild', None) else None
             if not guild_icon:
                 guild_icon = getattr(channel.guild, 'icon_url', None) if getattr(channel, 'guild', None) else None
-        em.set_footer(text="Auto Translate Plugin", icon_url=guild_icon)
-        await channel.send(embed=em)
+        # Paginate under the embed description limit (~4096)
+        for page in paginate(translated):
+            em = discord.Embed(description=page, color=4388013)
+            # Footer token prevents our listener from translating our own embeds again
+            em.set_footer(text="Auto Translate Plugin", icon_url=guild_icon)
+            try:
+                await channel.send(embed=em)
+            except (discord.Forbidden, discord.NotFound):
+                # Missing permissions or the thread is gone; the remaining pages would fail too
+                logger.warning('Could not post auto-translation in channel %s.', channel.id, exc_info=True)
+                return
+            except discord.HTTPException:
+                logger.warning('Failed to post an auto-translation page in channel %s.', channel.id, exc_info=True)
 
 
 async def setup(bot):